@@ -3,28 +3,109 @@ import tempfile
 import uuid
 import json
 import asyncio
+import signal
+import threading
+import time
 from werkzeug.utils import secure_filename
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, g, has_request_context, render_template, request, jsonify, send_file
 from datetime import datetime
+from io import BytesIO
 from dotenv import load_dotenv
 from resume_optimization import (
     process_resume_file,
-    create_ats_analysis_chain,
-    create_resume_optimization_chain,
-    create_cover_letter_chain,
-    create_docx_document,
-    create_pdf_document
+    ChainRegistry,
+    LLMTimeoutError,
+    ATSScore,
+    ResumeOptimization,
+    CoverLetterOutput,
+    SectionRewrite,
+    ATSAnalysisAndOptimization
 )
+from result_cache import create_result_cache, chain_cache_key
+from session_store import create_session_store
+from job_queue import JobQueue, QueueFullError
+from ats_scorer import local_ats_analysis, format_keyword_metrics, reconcile_missing_keywords, weighted_total
+from batch_scoring import rank_batch, rank_by_similarity, fast_score, RowSerializer
+from similarity import create_similarity_index
+from document_extraction import ExtractionLimitError, extraction_stats
+from text_cache import create_text_cache
+from jd_cache import create_jd_cache
+from metrics import HTTP_REQUEST_SECONDS, stage_timer, registry as metrics_registry
+from resume_sections import splice_summary, splice_bullets, split_bullets
+from token_budget import TokenStats, fit_to_budget
+from render_cache import RenderedDocumentCache, MIMETYPES, document_etag, content_hash
+from document_rendering import RenderTimeoutError, rendering_stats
+from worker_pool import PoolBusyError
+from llm_router import LLMUnavailableError, LLM_BREAKER_COOLDOWN
 
 # Initialize Flask app
 app = Flask(__name__, static_folder='static')
 app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB max file size
+app.config['BATCH_MAX_CONTENT_LENGTH'] = int(os.getenv("BATCH_MAX_CONTENT_LENGTH", str(100 * 1024 * 1024)))
+app.config['BATCH_MAX_RESUMES'] = int(os.getenv("BATCH_MAX_RESUMES", "500"))
+app.config['BATCH_MAX_JOB_DESCRIPTIONS'] = int(os.getenv("BATCH_MAX_JOB_DESCRIPTIONS", "50"))
+app.config['BATCH_CONCURRENCY'] = int(os.getenv("BATCH_CONCURRENCY", "4"))
+app.config['SIMILARITY_TOP_K'] = int(os.getenv("SIMILARITY_TOP_K", "10"))
+app.config['PRERENDER_DOCUMENTS'] = os.getenv("PRERENDER_DOCUMENTS", "false").lower() in ('1', 'true', 'yes')
+app.config['RESCORE_MODE'] = os.getenv("RESCORE_MODE", "llm")
+app.config['RESCORE_ON_SAVE'] = os.getenv("RESCORE_ON_SAVE", "true").lower() in ('1', 'true', 'yes')
+app.config['RESCORE_POLL_INTERVAL'] = float(os.getenv("RESCORE_POLL_INTERVAL", "0.5"))
+app.config['RESCORE_STREAM_TIMEOUT'] = float(os.getenv("RESCORE_STREAM_TIMEOUT", "120"))
+app.config['JD_PROMPT_MODE'] = os.getenv("JD_PROMPT_MODE", "requirements")
 
 # Configure environment variables
 load_dotenv()
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
+# Chains are built once per process and shared across requests
+chain_registry = ChainRegistry(openai_api_key)
+
+def reload_chains(*_):
+    # Re-read .env so a rotated key or model change takes effect without a restart
+    load_dotenv(override=True)
+    chain_registry.configure(
+        os.getenv("OPENAI_API_KEY"),
+        model_name=os.getenv("OPENAI_MODEL"),
+        temperature=os.getenv("OPENAI_TEMPERATURE")
+    )
+
+if hasattr(signal, 'SIGHUP'):
+    try:
+        signal.signal(signal.SIGHUP, reload_chains)
+    except ValueError:
+        # Not in the main thread (e.g. imported by a worker); reload via configure() instead
+        pass
+
+# Session state shared by all workers (SESSION_STORE_URL: memory://, sqlite:///path, redis://host)
+session_store = create_session_store()
+
+# Background jobs run on the chain registry's event loop (JOB_CONCURRENCY, JOB_QUEUE_DEPTH)
+job_queue = JobQueue(chain_registry.event_loop)
+
+# Cache for LLM chain results (in-process LRU, optional SQLite tier via RESULT_CACHE_DB)
+result_cache = create_result_cache()
+
+# Extracted resume text keyed by upload content hash (TEXT_CACHE_SIZE, optional TEXT_CACHE_DB)
+text_cache = create_text_cache()
+
+# Requirement sets extracted from job descriptions, keyed by normalized-text hash
+# with SimHash near-duplicate matching (JD_CACHE_SIZE, JD_SIMHASH_DISTANCE, optional JD_CACHE_DB)
+jd_cache = create_jd_cache()
+
+# Prompt token accounting (TOKEN_BUDGET_<CHAIN> budgets)
+token_stats = TokenStats()
+
+# Resume vectors for similarity ranking (SIMILARITY_INDEX_DIR persists them across restarts)
+similarity_index = create_similarity_index()
+
+# Rendered DOCX/PDF downloads (RENDER_CACHE_SIZE entries, PRERENDER_DOCUMENTS to warm it)
+render_cache = RenderedDocumentCache()
+
+# Optimized resumes re-scored in the background (RESCORE_MODE=llm|local)
+rescoring = set()
+rescoring_lock = threading.Lock()
+
 # Async helper functions
 async def run_async(func, *args, **kwargs):
     if asyncio.iscoroutinefunction(func):
@@ -33,6 +114,276 @@ async def run_async(func, *args, **kwargs):
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
 
+def budget_inputs(chain_name, inputs):
+    # Strips JD boilerplate, compacts the ATS analysis and enforces the chain's token budget
+    chain = chain_registry.get(chain_name)
+    fitted, report = fit_to_budget(
+        chain_name, chain.first, inputs, model_name=getattr(chain.middle[0], 'model_name', None)
+    )
+    token_stats.record(report)
+    if has_request_context():
+        g.prompt_tokens = g.get('prompt_tokens', 0) + report['prompt_tokens']
+        g.tokens_saved = g.get('tokens_saved', 0) + report['tokens_saved']
+    return fitted
+
+def reconcile_ats_result(chain_name, inputs, result):
+    # missing_keywords is made deterministic with the skills taxonomy before caching
+    if chain_name == 'ats_analysis':
+        ats = result
+    elif chain_name == 'analyze_and_optimize':
+        ats = result.ats_analysis
+    else:
+        return
+    ats.missing_keywords = reconcile_missing_keywords(ats.missing_keywords, inputs['resume_text'], inputs['job_description'])
+
+async def invoke_cached(chain_name, inputs, output_model, bypass_cache=False):
+    # Native async model call on the shared loop (LLM_CONCURRENCY, LLM_TIMEOUT); no thread is held while waiting
+    with stage_timer(chain_name):
+        key = chain_cache_key(chain_registry.get(chain_name), inputs)
+        if not bypass_cache:
+            cached = await run_async(result_cache.get, key)
+            if cached is not None:
+                return output_model.model_validate(cached)
+
+        result = await chain_registry.ainvoke(chain_name, budget_inputs(chain_name, inputs))
+        reconcile_ats_result(chain_name, inputs, result)
+        # Regenerated results still refresh the cache so later identical requests see them
+        await run_async(result_cache.set, key, result.model_dump())
+        return result
+
+# Session helpers: derived fields are stored separately so preview/download stay cheap
+def save_ats_session(session_id, resume_text, job_description, original_ats_result, optimization_result):
+    with stage_timer('persist'):
+        session_store.set_fields(session_id, 'ats', {
+            'resume_text': resume_text,
+            'job_description': job_description,
+            'original_ats_analysis': original_ats_result.model_dump(),
+            'optimization_result': optimization_result.model_dump(),
+            'improved_resume_text': optimization_result.improved_resume_text,
+            'original_score': original_ats_result.total_ats_score
+        })
+    schedule_prerender(session_id, 'resume', optimization_result.improved_resume_text)
+    if app.config['RESCORE_ON_SAVE']:
+        schedule_rescore(session_id, job_description, optimization_result.improved_resume_text)
+
+def save_cover_letter_session(session_id, resume_text, job_description, cover_letter_result):
+    with stage_timer('persist'):
+        session_store.set_fields(session_id, 'cover_letter', {
+            'resume_text': resume_text,
+            'job_description': job_description,
+            'cover_letter': cover_letter_result.model_dump(),
+            'cover_letter_text': cover_letter_result.cover_letter_text
+        })
+    schedule_prerender(session_id, 'cover_letter', cover_letter_result.cover_letter_text)
+
+def schedule_prerender(session_id, document_type, content):
+    # Render both download formats in the background so the first click is a cache hit
+    if app.config['PRERENDER_DOCUMENTS'] and content:
+        chain_registry.event_loop.submit(render_cache.prerender(session_id, document_type, content))
+
+def schedule_rescore(session_id, job_description, improved_resume_text):
+    # Marks the optimized score pending and scores the improved text on the
+    # background loop; preview and /score read the result from the session
+    key = (session_id, content_hash(improved_resume_text))
+    with rescoring_lock:
+        if key in rescoring:
+            return
+        rescoring.add(key)
+    session_store.set_fields(session_id, 'ats', {
+        'optimized_score_status': 'pending',
+        'optimized_score_hash': key[1]
+    })
+    chain_registry.event_loop.submit(rescore_optimized(key, job_description, improved_resume_text))
+
+async def rescore_optimized(key, job_description, improved_resume_text):
+    # Runs on the shared chain loop, so local scoring and prompt preparation are
+    # offloaded to a thread instead of stalling in-flight LLM calls
+    session_id, text_hash = key
+    fields = {'optimized_score_status': 'failed', 'optimized_score_error': 'Rescoring did not complete'}
+    try:
+        with stage_timer('rescore'):
+            if app.config['RESCORE_MODE'] == 'local':
+                optimized = await asyncio.to_thread(local_ats_analysis, improved_resume_text, job_description)
+            else:
+                inputs = await asyncio.to_thread(ats_inputs, improved_resume_text, job_description)
+                optimized = (await invoke_cached('ats_analysis', inputs, ATSScore)).model_dump()
+        fields = {'optimized_ats_analysis': optimized, 'optimized_score_status': 'ready'}
+    except Exception as e:
+        fields = {'optimized_score_status': 'failed', 'optimized_score_error': str(e)}
+    finally:
+        with rescoring_lock:
+            rescoring.discard(key)
+    # A regenerated resume supersedes this score; its own rescore is already scheduled
+    current = await run_async(session_store.get_field, session_id, 'ats', 'optimized_score_hash')
+    if current == text_hash:
+        await run_async(session_store.set_fields, session_id, 'ats', fields)
+
+def optimized_score_state(data):
+    status = data.get('optimized_score_status')
+    if status is None and data.get('optimized_ats_analysis'):
+        status = 'ready'
+    state = {'status': status or 'pending', 'optimized_score': None}
+    if status == 'ready':
+        state['optimized_score'] = data['optimized_ats_analysis'].get('total_ats_score', 0)
+    elif status == 'failed':
+        state['error'] = data.get('optimized_score_error')
+    return state
+
+SCORE_FIELDS = [
+    'job_description', 'improved_resume_text', 'original_score', 'optimized_ats_analysis',
+    'optimized_score_status', 'optimized_score_error'
+]
+
+def load_score_state(session_id):
+    # Sessions saved without a score (RESCORE_ON_SAVE=false) are scored on first read
+    data = session_store.get_fields(session_id, 'ats', SCORE_FIELDS)
+    if data is None:
+        return None, None
+    if data.get('optimized_score_status') is None and not data.get('optimized_ats_analysis'):
+        schedule_rescore(session_id, data['job_description'], data['improved_resume_text'])
+    return data, optimized_score_state(data)
+
+# Chain inputs
+def ats_inputs(resume_text, job_description, compact=True):
+    # Local keyword metrics pre-fill the ATS prompt so the LLM starts from deterministic numbers.
+    # With JD_PROMPT_MODE=requirements the posting itself is replaced by its cached
+    # requirement set; the metrics are still computed against the full text.
+    keyword_metrics = format_keyword_metrics(resume_text, job_description)
+    if compact and app.config['JD_PROMPT_MODE'] == 'requirements':
+        job_description = jd_cache.lookup(job_description)['prompt']
+    return {
+        "resume_text": resume_text,
+        "job_description": job_description,
+        "keyword_metrics": keyword_metrics
+    }
+
+def optimization_inputs(resume_text, job_description, ats_result):
+    return {
+        "resume_text": resume_text,
+        "job_description": job_description,
+        "ats_analysis": json.dumps(ats_result.model_dump())
+    }
+
+async def single_pass_analysis(resume_text, job_description, bypass_cache=False):
+    # mode=single: one structured-output call returns the ATS analysis and the
+    # rewrite; the weighted total is then recomputed locally from the sub-scores
+    # The rewrite half of this prompt needs the full posting
+    inputs = await asyncio.to_thread(ats_inputs, resume_text, job_description, compact=False)
+    combined = await invoke_cached('analyze_and_optimize', inputs, ATSAnalysisAndOptimization, bypass_cache=bypass_cache)
+    ats_result = combined.ats_analysis
+    ats_result.total_ats_score = round(weighted_total(ats_result.model_dump()), 2)
+    return ats_result, combined.optimization
+
+# Background pipelines
+async def run_two_pass_stages(job, resume_text, job_description):
+    started = time.perf_counter()
+    inputs = await asyncio.to_thread(ats_inputs, resume_text, job_description)
+    original_ats_result = await invoke_cached('ats_analysis', inputs, ATSScore)
+    job.record_stage('ats_analysis', time.perf_counter() - started)
+    job.update(ats_analysis=original_ats_result.model_dump())
+    
+    started = time.perf_counter()
+    optimization_result = await invoke_cached(
+        'resume_optimization',
+        optimization_inputs(resume_text, job_description, original_ats_result),
+        ResumeOptimization
+    )
+    job.record_stage('resume_optimization', time.perf_counter() - started)
+    
+    return original_ats_result, optimization_result
+
+async def run_ats_job(job, resume_text, job_description, mode='full'):
+    if mode == 'single':
+        started = time.perf_counter()
+        original_ats_result, optimization_result = await single_pass_analysis(resume_text, job_description)
+        job.record_stage('analyze_and_optimize', time.perf_counter() - started)
+        job.update(ats_analysis=original_ats_result.model_dump())
+    else:
+        original_ats_result, optimization_result = await run_two_pass_stages(job, resume_text, job_description)
+    
+    started = time.perf_counter()
+    session_id = str(uuid.uuid4())
+    await run_async(save_ats_session, session_id, resume_text, job_description,
+                    original_ats_result, optimization_result)
+    job.record_stage('persistence', time.perf_counter() - started)
+    job.update(session_id=session_id, optimization_result=optimization_result.model_dump())
+
+# Server-Sent Events helpers
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sse_response(generator):
+    return Response(generator, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def stream_text_field(chain_name, inputs, field):
+    # Yields SSE 'delta' events for the growing text field and returns the validated model
+    output_model = chain_registry.output_model(chain_name)
+    key = chain_cache_key(chain_registry.get(chain_name), inputs)
+    cached = result_cache.get(key)
+    if cached is not None:
+        result = output_model.model_validate(cached)
+        yield sse_event('delta', {'field': field, 'text': getattr(result, field)})
+        return result
+
+    emitted = 0
+    partial = None
+    for partial in chain_registry.stream(chain_name, budget_inputs(chain_name, inputs)):
+        text = partial.get(field) if isinstance(partial, dict) else None
+        if isinstance(text, str) and len(text) > emitted:
+            yield sse_event('delta', {'field': field, 'text': text[emitted:]})
+            emitted = len(text)
+
+    result = output_model.model_validate(partial)
+    result_cache.set(key, result.model_dump())
+    return result
+
+# Error handlers
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    if 'request_started' in g:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - g.request_started,
+            request.url_rule.rule if request.url_rule else 'unmatched',
+            request.method,
+            str(response.status_code)
+        )
+    return response
+
+@app.after_request
+def add_token_headers(response):
+    # Per-request prompt size and the tokens saved by compaction/budgeting
+    if 'prompt_tokens' in g:
+        response.headers['X-Prompt-Tokens'] = str(g.prompt_tokens)
+        response.headers['X-Prompt-Tokens-Saved'] = str(g.tokens_saved)
+    return response
+
+@app.errorhandler(ExtractionLimitError)
+def handle_extraction_limit(e):
+    return jsonify({'error': str(e)}), 422
+
+@app.errorhandler(PoolBusyError)
+def handle_pool_busy(e):
+    return jsonify({'error': 'Server is busy, please retry shortly'}), 503, {'Retry-After': '5'}
+
+@app.errorhandler(LLMTimeoutError)
+def handle_llm_timeout(e):
+    return jsonify({'error': str(e)}), 504
+
+@app.errorhandler(LLMUnavailableError)
+def handle_llm_unavailable(e):
+    return jsonify({'error': str(e)}), 503, {'Retry-After': str(int(LLM_BREAKER_COOLDOWN))}
+
+@app.errorhandler(RenderTimeoutError)
+def handle_render_timeout(e):
+    return jsonify({'error': str(e)}), 504
+
 # Flask routes
 @app.route('/')
 def index():
@@ -45,6 +396,7 @@ async def analyze_ats():
     
     resume_file = request.files['resume']
     job_description = request.form.get('job_description', '')
+    mode = request.form.get('mode', request.args.get('mode', 'full'))
     
     if resume_file.filename == '':
         return jsonify({'error': 'No resume file selected'}), 400
@@ -52,40 +404,35 @@ async def analyze_ats():
     if not job_description:
         return jsonify({'error': 'Job description is required'}), 400
     
+    if mode not in ('full', 'fast', 'single'):
+        return jsonify({'error': 'Invalid mode'}), 400
+    
     # Process resume
-    resume_text, file_path = await process_resume_file(resume_file, app.config['UPLOAD_FOLDER'])
+    resume_text = await process_resume_file(resume_file, app.config['UPLOAD_FOLDER'], text_cache=text_cache)
     if not resume_text:
         return jsonify({'error': 'Could not extract text from resume'}), 400
     
-    # Create chains
-    ats_chain = create_ats_analysis_chain(openai_api_key)
-    optimization_chain = create_resume_optimization_chain(openai_api_key)
-    
-    # Run ATS analysis
-    original_ats_result = await run_async(ats_chain.invoke, {
-        "resume_text": resume_text,
-        "job_description": job_description
-    })
-    
-    # Optimize resume
-    optimization_result = await run_async(optimization_chain.invoke, {
-        "resume_text": resume_text,
-        "job_description": job_description,
-        "ats_analysis": json.dumps(original_ats_result.model_dump())
-    })
+    if mode == 'single':
+        # One LLM call for both the analysis and the rewrite
+        original_ats_result, optimization_result = await single_pass_analysis(resume_text, job_description)
+    else:
+        # Run ATS analysis (fast mode scores locally instead of asking the LLM)
+        if mode == 'fast':
+            original_ats_result = ATSScore.model_validate(local_ats_analysis(resume_text, job_description))
+        else:
+            original_ats_result = await invoke_cached('ats_analysis', ats_inputs(resume_text, job_description), ATSScore)
+        
+        # Optimize resume
+        optimization_result = await invoke_cached(
+            'resume_optimization',
+            optimization_inputs(resume_text, job_description, original_ats_result),
+            ResumeOptimization
+        )
     
     # Create session
     session_id = str(uuid.uuid4())
-    temp_dir = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # Store data
-    await run_async(lambda: json.dump({
-        'resume_text': resume_text,
-        'job_description': job_description,
-        'original_ats_analysis': original_ats_result.model_dump(),
-        'optimization_result': optimization_result.model_dump()
-    }, open(os.path.join(temp_dir, 'ats_data.json'), 'w')))
+    await run_async(save_ats_session, session_id, resume_text, job_description,
+                    original_ats_result, optimization_result)
     
     return jsonify({
         'session_id': session_id,
@@ -93,6 +440,97 @@ async def analyze_ats():
         'optimization_result': optimization_result.model_dump()
     })
 
+@app.route('/analyze-ats/stream', methods=['POST'])
+async def analyze_ats_stream():
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No resume file uploaded'}), 400
+    
+    resume_file = request.files['resume']
+    job_description = request.form.get('job_description', '')
+    
+    if resume_file.filename == '':
+        return jsonify({'error': 'No resume file selected'}), 400
+    
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    # Process resume
+    resume_text = await process_resume_file(resume_file, app.config['UPLOAD_FOLDER'], text_cache=text_cache)
+    if not resume_text:
+        return jsonify({'error': 'Could not extract text from resume'}), 400
+    
+    def generate():
+        try:
+            yield sse_event('status', {'stage': 'ats_analysis'})
+            original_ats_result = chain_registry.event_loop.submit(
+                invoke_cached('ats_analysis', ats_inputs(resume_text, job_description), ATSScore)
+            ).result()
+            yield sse_event('ats_analysis', original_ats_result.model_dump())
+            
+            # Stream the optimized resume as it is written
+            yield sse_event('status', {'stage': 'resume_optimization'})
+            optimization_result = yield from stream_text_field(
+                'resume_optimization',
+                optimization_inputs(resume_text, job_description, original_ats_result),
+                'improved_resume_text'
+            )
+            
+            # Create session
+            session_id = str(uuid.uuid4())
+            save_ats_session(session_id, resume_text, job_description,
+                             original_ats_result, optimization_result)
+            
+            yield sse_event('result', {
+                'session_id': session_id,
+                'ats_analysis': original_ats_result.model_dump(),
+                'optimization_result': optimization_result.model_dump()
+            })
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+    
+    return sse_response(generate())
+
+@app.route('/generate-cover-letter/stream', methods=['POST'])
+async def generate_cover_letter_stream():
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No resume file uploaded'}), 400
+    
+    resume_file = request.files['resume']
+    job_description = request.form.get('job_description', '')
+    
+    if resume_file.filename == '':
+        return jsonify({'error': 'No resume file selected'}), 400
+    
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    # Process resume
+    resume_text = await process_resume_file(resume_file, app.config['UPLOAD_FOLDER'], text_cache=text_cache)
+    if not resume_text:
+        return jsonify({'error': 'Could not extract text from resume'}), 400
+    
+    inputs = {
+        "resume_text": resume_text,
+        "job_description": job_description
+    }
+    
+    def generate():
+        try:
+            cover_letter_result = yield from stream_text_field('cover_letter', inputs, 'cover_letter_text')
+            
+            # Create session
+            session_id = str(uuid.uuid4())
+            save_cover_letter_session(session_id, resume_text, job_description, cover_letter_result)
+            
+            yield sse_event('result', {
+                'session_id': session_id,
+                'cover_letter': cover_letter_result.cover_letter_text
+            })
+        except Exception as e:
+            yield sse_event('error', {'error': str(e)})
+    
+    return sse_response(generate())
+
 @app.route('/generate-cover-letter', methods=['POST'])
 async def generate_cover_letter():
     if 'resume' not in request.files:
@@ -108,101 +546,209 @@ async def generate_cover_letter():
         return jsonify({'error': 'Job description is required'}), 400
     
     # Process resume
-    resume_text, file_path = await run_async(process_resume_file, resume_file, app.config['UPLOAD_FOLDER'])
+    resume_text = await process_resume_file(resume_file, app.config['UPLOAD_FOLDER'], text_cache=text_cache)
     if not resume_text:
         return jsonify({'error': 'Could not extract text from resume'}), 400
     
     # Generate cover letter
-    cover_letter_chain = create_cover_letter_chain(openai_api_key)
-    cover_letter_result = await run_async(cover_letter_chain.invoke, {
+    cover_letter_result = await invoke_cached('cover_letter', {
         "resume_text": resume_text,
         "job_description": job_description
-    })
+    }, CoverLetterOutput)
     
     # Create session
     session_id = str(uuid.uuid4())
-    temp_dir = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # Store data
-    await run_async(lambda: json.dump({
-        'resume_text': resume_text,
-        'job_description': job_description,
-        'cover_letter': cover_letter_result.model_dump()  
-    }, open(os.path.join(temp_dir, 'cover_letter_data.json'), 'w')))
+    await run_async(save_cover_letter_session, session_id, resume_text, job_description, cover_letter_result)
     
     return jsonify({
         'session_id': session_id,
         'cover_letter': cover_letter_result.cover_letter_text  
     })
 
-@app.route('/regenerate-ats/<session_id>', methods=['POST'])
-async def regenerate_ats(session_id):
-    temp_dir = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
-    data_file = os.path.join(temp_dir, 'ats_data.json')
+@app.route('/analyze-all', methods=['POST'])
+async def analyze_all():
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No resume file uploaded'}), 400
     
-    if not os.path.exists(data_file):
-        return jsonify({'error': 'Session data not found'}), 404
+    resume_file = request.files['resume']
+    job_description = request.form.get('job_description', '')
+    mode = request.form.get('mode', request.args.get('mode', 'full'))
     
-    data = await run_async(lambda: json.load(open(data_file, 'r')))
+    if resume_file.filename == '':
+        return jsonify({'error': 'No resume file selected'}), 400
     
-    resume_text = data['resume_text']
-    job_description = data['job_description']
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    if mode not in ('full', 'single'):
+        return jsonify({'error': 'Invalid mode'}), 400
+    
+    # Process resume once for both pipelines
+    resume_text = await process_resume_file(resume_file, app.config['UPLOAD_FOLDER'], text_cache=text_cache)
+    if not resume_text:
+        return jsonify({'error': 'Could not extract text from resume'}), 400
     
-    # Re-run analysis
-    ats_chain = create_ats_analysis_chain(openai_api_key)
-    original_ats_result = await run_async(ats_chain.invoke, {
+    inputs = {
         "resume_text": resume_text,
         "job_description": job_description
+    }
+    
+    async def ats_pipeline():
+        if mode == 'single':
+            return await single_pass_analysis(resume_text, job_description)
+        ats_result = await invoke_cached('ats_analysis', ats_inputs(resume_text, job_description), ATSScore)
+        optimization = await invoke_cached(
+            'resume_optimization',
+            optimization_inputs(resume_text, job_description, ats_result),
+            ResumeOptimization
+        )
+        return ats_result, optimization
+    
+    # Optimization depends on the ATS result, the cover letter does not
+    (original_ats_result, optimization_result), cover_letter_result = await asyncio.gather(
+        ats_pipeline(),
+        invoke_cached('cover_letter', inputs, CoverLetterOutput)
+    )
+    
+    # Create a single session holding both documents
+    session_id = str(uuid.uuid4())
+    await run_async(save_ats_session, session_id, resume_text, job_description,
+                    original_ats_result, optimization_result)
+    await run_async(save_cover_letter_session, session_id, resume_text, job_description, cover_letter_result)
+    
+    return jsonify({
+        'session_id': session_id,
+        'ats_analysis': original_ats_result.model_dump(),
+        'optimization_result': optimization_result.model_dump(),
+        'cover_letter': cover_letter_result.cover_letter_text
     })
+
+@app.route('/regenerate-ats/<session_id>', methods=['POST'])
+async def regenerate_ats(session_id):
+    data = await run_async(session_store.get_fields, session_id, 'ats', ['resume_text', 'job_description'])
+    if data is None:
+        return jsonify({'error': 'Session data not found'}), 404
+    
+    resume_text = data['resume_text']
+    job_description = data['job_description']
+    
+    # Re-run analysis (regenerate always bypasses the result cache)
+    original_ats_result = await invoke_cached(
+        'ats_analysis', ats_inputs(resume_text, job_description), ATSScore, bypass_cache=True
+    )
     
     # Re-run optimization
-    optimization_chain = create_resume_optimization_chain(openai_api_key)
-    optimization_result = await run_async(optimization_chain.invoke, {
-        "resume_text": resume_text,
-        "job_description": job_description,
-        "ats_analysis": json.dumps(original_ats_result.model_dump())
-    })
+    optimization_result = await invoke_cached(
+        'resume_optimization',
+        optimization_inputs(resume_text, job_description, original_ats_result),
+        ResumeOptimization,
+        bypass_cache=True
+    )
     
     # Update data
-    await run_async(lambda: json.dump({
-        'resume_text': resume_text,
-        'job_description': job_description,
-        'original_ats_analysis': original_ats_result.model_dump(),
-        'optimization_result': optimization_result.model_dump()
-    }, open(data_file, 'w')))
+    await run_async(save_ats_session, session_id, resume_text, job_description,
+                    original_ats_result, optimization_result)
     
     return jsonify({
         'ats_analysis': original_ats_result.model_dump(),
         'optimization_result': optimization_result.model_dump()
     })
 
-@app.route('/regenerate-cover-letter/<session_id>', methods=['POST'])
-async def regenerate_cover_letter(session_id):
-    temp_dir = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
-    data_file = os.path.join(temp_dir, 'cover_letter_data.json')
+@app.route('/regenerate-section/<session_id>', methods=['POST'])
+async def regenerate_section(session_id):
+    # Re-runs the LLM only for the requested sections ('summary' or a role key of
+    # improved_bullets) and splices the results into improved_resume_text
+    payload = request.get_json(silent=True)
+    if payload is not None:
+        sections = payload.get('sections') or []
+        instructions = payload.get('instructions', '')
+    else:
+        sections = request.form.getlist('sections')
+        instructions = request.form.get('instructions', '')
     
-    if not os.path.exists(data_file):
+    if not sections:
+        return jsonify({'error': 'At least one section is required'}), 400
+    
+    data = await run_async(session_store.get_fields, session_id, 'ats', [
+        'job_description', 'original_ats_analysis', 'optimization_result', 'improved_resume_text'
+    ])
+    if data is None:
         return jsonify({'error': 'Session data not found'}), 404
     
-    data = await run_async(lambda: json.load(open(data_file, 'r')))
+    optimization = dict(data['optimization_result'])
+    improved_bullets = dict(optimization.get('improved_bullets') or {})
+    unknown = [section for section in sections if section != 'summary' and section not in improved_bullets]
+    if unknown:
+        return jsonify({'error': f"Unknown sections: {', '.join(unknown)}", 'available': ['summary', *improved_bullets]}), 400
+    
+    missing_keywords = ', '.join((data.get('original_ats_analysis') or {}).get('missing_keywords') or []) or 'none'
+    
+    async def rewrite(section):
+        current = optimization.get('improved_summary', '') if section == 'summary' else '\n'.join(improved_bullets[section])
+        return await invoke_cached('section_rewrite', {
+            "section_name": 'Professional Summary' if section == 'summary' else f"Experience: {section}",
+            "current_content": current,
+            "job_description": data['job_description'],
+            "missing_keywords": missing_keywords,
+            "instructions": instructions or 'none'
+        }, SectionRewrite, bypass_cache=True)
+    
+    requested = list(dict.fromkeys(sections))
+    rewrites = await asyncio.gather(*(rewrite(section) for section in requested))
+    
+    # Splice each rewrite into the stored text and the structured result
+    improved_resume_text = data['improved_resume_text']
+    not_spliced = []
+    for section, rewrite_result in zip(requested, rewrites):
+        if section == 'summary':
+            new_summary = rewrite_result.improved_text.strip()
+            improved_resume_text, spliced = splice_summary(improved_resume_text, optimization.get('improved_summary'), new_summary)
+            optimization['improved_summary'] = new_summary
+        else:
+            new_bullets = split_bullets(rewrite_result.improved_text)
+            improved_resume_text, spliced = splice_bullets(improved_resume_text, section, improved_bullets[section], new_bullets)
+            improved_bullets[section] = new_bullets
+        if not spliced:
+            not_spliced.append(section)
+    if not_spliced:
+        # Nothing is saved, so the structured result and the text stay in step
+        return jsonify({
+            'error': f"Could not locate {', '.join(not_spliced)} in the optimized resume",
+            'not_spliced': not_spliced
+        }), 409
+    optimization['improved_bullets'] = improved_bullets
+    optimization['improved_resume_text'] = improved_resume_text
+    
+    await run_async(session_store.set_fields, session_id, 'ats', {
+        'optimization_result': optimization,
+        'improved_resume_text': improved_resume_text
+    })
+    schedule_prerender(session_id, 'resume', improved_resume_text)
+    if app.config['RESCORE_ON_SAVE']:
+        await run_async(schedule_rescore, session_id, data['job_description'], improved_resume_text)
+    
+    return jsonify({
+        'optimization_result': optimization,
+        'regenerated_sections': requested
+    })
+
+@app.route('/regenerate-cover-letter/<session_id>', methods=['POST'])
+async def regenerate_cover_letter(session_id):
+    data = await run_async(session_store.get_fields, session_id, 'cover_letter', ['resume_text', 'job_description'])
+    if data is None:
+        return jsonify({'error': 'Session data not found'}), 404
     
     resume_text = data['resume_text']
     job_description = data['job_description']
     
-    # Re-generate cover letter
-    cover_letter_chain = create_cover_letter_chain(openai_api_key)
-    cover_letter_result = await run_async(cover_letter_chain.invoke, {
+    # Re-generate cover letter (bypasses the result cache)
+    cover_letter_result = await invoke_cached('cover_letter', {
         "resume_text": resume_text,
         "job_description": job_description
-    })
+    }, CoverLetterOutput, bypass_cache=True)
     
-    # Update data 
-    await run_async(lambda: json.dump({
-        'resume_text': resume_text,
-        'job_description': job_description,
-        'cover_letter': cover_letter_result.model_dump()  
-    }, open(data_file, 'w')))
+    # Update data
+    await run_async(save_cover_letter_session, session_id, resume_text, job_description, cover_letter_result)
     
     return jsonify({
         'cover_letter': cover_letter_result.cover_letter_text  
@@ -210,86 +756,323 @@ async def regenerate_cover_letter(session_id):
 
 @app.route('/preview/<document_type>/<session_id>')
 async def preview_document(document_type, session_id):
-    temp_dir = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
-    
     try:
         if document_type == 'resume':
-            data_file = os.path.join(temp_dir, 'ats_data.json')
-            if not os.path.exists(data_file):
+            data, score = load_score_state(session_id)
+            if data is None:
                 return jsonify({'error': 'Session data not found'}), 404
             
-            with open(data_file, 'r') as f:
-                data = json.load(f)
-            
-            content = data['optimization_result']['improved_resume_text']
-            return jsonify({
+            # The optimized score is computed in the background; until it is ready
+            # the preview reports it as pending and points at the poll/SSE routes
+            content = data['improved_resume_text']
+            response = jsonify({
                 'content': content,
                 'score_comparison': {
-                    'original_score': data['original_ats_analysis']['total_ats_score'],
-                    'optimized_score': data.get('optimized_ats_analysis', {}).get('total_ats_score', 0)
+                    'original_score': data['original_score'],
+                    'optimized_score': score['optimized_score'],
+                    'optimized_score_status': score['status'],
+                    'score_url': f"/score/{session_id}",
+                    'score_stream_url': f"/score/{session_id}/stream"
                 }
             })
             
         elif document_type == 'cover_letter':
-            data_file = os.path.join(temp_dir, 'cover_letter_data.json')
-            if not os.path.exists(data_file):
+            content = session_store.get_field(session_id, 'cover_letter', 'cover_letter_text')
+            if content is None:
                 return jsonify({'error': 'Session data not found'}), 404
             
-            with open(data_file, 'r') as f:
-                data = json.load(f)
-            
-            content = data['cover_letter']['cover_letter_text']
-            return jsonify({'content': content})
+            response = jsonify({'content': content})
         
-        return jsonify({'error': 'Invalid document type'}), 400
+        else:
+            return jsonify({'error': 'Invalid document type'}), 400
+        
+        # Repeat previews of unchanged content get an empty 304
+        response.add_etag()
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/score/<session_id>')
+def optimized_score(session_id):
+    data, score = load_score_state(session_id)
+    if data is None:
+        return jsonify({'error': 'Session data not found'}), 404
+    if score['status'] == 'ready':
+        score['optimized_ats_analysis'] = data['optimized_ats_analysis']
+    return jsonify(score)
+
+@app.route('/score/<session_id>/stream')
+def optimized_score_stream(session_id):
+    data, score = load_score_state(session_id)
+    if data is None:
+        return jsonify({'error': 'Session data not found'}), 404
+    
+    def generate():
+        # Polls the session store, so the score arrives whichever worker computed it
+        state = score
+        deadline = time.monotonic() + app.config['RESCORE_STREAM_TIMEOUT']
+        while state['status'] == 'pending' and time.monotonic() < deadline:
+            yield sse_event('status', state)
+            time.sleep(app.config['RESCORE_POLL_INTERVAL'])
+            state = optimized_score_state(session_store.get_fields(session_id, 'ats', SCORE_FIELDS) or {})
+        yield sse_event('score' if state['status'] != 'pending' else 'timeout', state)
+    
+    return sse_response(generate())
+
 @app.route('/download/<file_type>/<document_type>/<session_id>')
 async def download_document(file_type, document_type, session_id):
-    temp_dir = os.path.join(app.config['UPLOAD_FOLDER'], session_id)
-    
     if document_type == 'resume':
-        data_file = os.path.join(temp_dir, 'ats_data.json')
-        if not os.path.exists(data_file):
+        content = session_store.get_field(session_id, 'ats', 'improved_resume_text')
+        if content is None:
             return jsonify({'error': 'Session data not found'}), 404
         
-        with open(data_file, 'r') as f:
-            data = json.load(f)
-        
-        content = data['optimization_result']['improved_resume_text']
         filename = f"optimized_resume.{file_type}"
         
     elif document_type == 'cover_letter':
-        data_file = os.path.join(temp_dir, 'cover_letter_data.json')
-        if not os.path.exists(data_file):
+        content = session_store.get_field(session_id, 'cover_letter', 'cover_letter_text')
+        if content is None:
             return jsonify({'error': 'Session data not found'}), 404
         
-        with open(data_file, 'r') as f:
-            data = json.load(f)
-        
-        content = data['cover_letter']['cover_letter_text']
         filename = f"cover_letter.{file_type}"
     else:
         return jsonify({'error': 'Invalid document type'}), 400
     
-    # Generate file asynchronously
-    if file_type == 'docx':
-        file_obj = await create_docx_document(content, document_type)
-        mimetype = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-    elif file_type == 'pdf':
-        file_obj = await create_pdf_document(content, document_type)
-        mimetype = 'application/pdf'
-    else:
+    if file_type not in MIMETYPES:
         return jsonify({'error': 'Invalid file type'}), 400
     
+    # The ETag comes from the source text, so a client's cached copy is
+    # confirmed without rendering anything
+    etag = document_etag(document_type, file_type, content)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    data = await render_cache.render(session_id, document_type, file_type, content)
     return send_file(
-        file_obj,
-        mimetype=mimetype,
+        BytesIO(data),
+        mimetype=MIMETYPES[file_type],
         as_attachment=True,
-        download_name=filename
+        download_name=filename,
+        etag=etag
     )
 
+@app.route('/batch/ats-score', methods=['POST'])
+async def batch_ats_score():
+    # Many resumes per request, so this route gets its own upload limit
+    request.max_content_length = app.config['BATCH_MAX_CONTENT_LENGTH']
+    
+    resume_files = [f for f in request.files.getlist('resumes') if f.filename]
+    job_descriptions = [jd for jd in request.form.getlist('job_descriptions') if jd.strip()]
+    if request.form.get('job_description', '').strip():
+        job_descriptions.append(request.form['job_description'])
+    mode = request.form.get('mode', 'fast')
+    output_format = request.form.get('format', 'ndjson')
+    
+    if not resume_files:
+        return jsonify({'error': 'No resume files uploaded'}), 400
+    
+    if not job_descriptions:
+        return jsonify({'error': 'At least one job description is required'}), 400
+    
+    if len(resume_files) > app.config['BATCH_MAX_RESUMES'] or len(job_descriptions) > app.config['BATCH_MAX_JOB_DESCRIPTIONS']:
+        return jsonify({'error': 'Too many resumes or job descriptions in one batch'}), 400
+    
+    if mode not in ('fast', 'llm', 'similarity') or output_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'Invalid mode or format'}), 400
+    
+    # Parse all uploads in parallel
+    extracted = await asyncio.gather(*(
+        process_resume_file(resume_file, app.config['UPLOAD_FOLDER'], text_cache=text_cache) for resume_file in resume_files
+    ))
+    resumes = [
+        (resume_file.filename, resume_text)
+        for resume_file, resume_text in zip(resume_files, extracted)
+        if resume_text
+    ]
+    if not resumes:
+        return jsonify({'error': 'Could not extract text from any resume'}), 400
+    
+    named_job_descriptions = [(f"jd_{index}", jd) for index, jd in enumerate(job_descriptions, start=1)]
+    
+    if mode == 'similarity':
+        # No per-pair scoring: one matrix multiply ranks every resume for a JD
+        ranked_batches = await run_async(
+            lambda: list(rank_by_similarity(resumes, named_job_descriptions, similarity_index))
+        )
+        serializer = RowSerializer(output_format)
+        body = ''.join(serializer(row) for rows in ranked_batches for row in rows)
+        return Response(body, mimetype='text/csv' if output_format == 'csv' else 'application/x-ndjson')
+    
+    if mode == 'fast':
+        score_pair = fast_score
+    else:
+        async def score_pair(resume_text, job_description):
+            result = await invoke_cached('ats_analysis', ats_inputs(resume_text, job_description), ATSScore)
+            return result.model_dump()
+    
+    def generate():
+        serializer = RowSerializer(output_format)
+        ranked_batches = chain_registry.event_loop.iterate(rank_batch(
+            resumes, named_job_descriptions, score_pair, concurrency=app.config['BATCH_CONCURRENCY']
+        ))
+        for rows in ranked_batches:
+            for row in rows:
+                yield serializer(row)
+    
+    mimetype = 'text/csv' if output_format == 'csv' else 'application/x-ndjson'
+    return Response(generate(), mimetype=mimetype)
+
+@app.route('/similarity/rank', methods=['POST'])
+async def similarity_rank():
+    # Top-k resumes per job description by vector similarity. Uploaded resumes are
+    # indexed and ranked among themselves; without uploads the whole index is searched.
+    request.max_content_length = app.config['BATCH_MAX_CONTENT_LENGTH']
+    
+    resume_files = [f for f in request.files.getlist('resumes') if f.filename]
+    job_descriptions = [jd for jd in request.form.getlist('job_descriptions') if jd.strip()]
+    if request.form.get('job_description', '').strip():
+        job_descriptions.append(request.form['job_description'])
+    try:
+        top_k = int(request.form.get('k', request.args.get('k', app.config['SIMILARITY_TOP_K'])))
+    except ValueError:
+        return jsonify({'error': 'k must be an integer'}), 400
+    if top_k < 1:
+        return jsonify({'error': 'k must be at least 1'}), 400
+    
+    if not job_descriptions:
+        return jsonify({'error': 'At least one job description is required'}), 400
+    
+    if len(resume_files) > app.config['BATCH_MAX_RESUMES'] or len(job_descriptions) > app.config['BATCH_MAX_JOB_DESCRIPTIONS']:
+        return jsonify({'error': 'Too many resumes or job descriptions in one request'}), 400
+    
+    doc_ids = None
+    if resume_files:
+        extracted = await asyncio.gather(*(
+            process_resume_file(resume_file, app.config['UPLOAD_FOLDER'], text_cache=text_cache) for resume_file in resume_files
+        ))
+        resumes = [
+            (resume_file.filename, resume_text)
+            for resume_file, resume_text in zip(resume_files, extracted)
+            if resume_text
+        ]
+        if not resumes:
+            return jsonify({'error': 'Could not extract text from any resume'}), 400
+        doc_ids = list(dict.fromkeys(await run_async(similarity_index.add_many, resumes)))
+    elif not len(similarity_index):
+        return jsonify({'error': 'No resumes uploaded or indexed'}), 400
+    
+    with stage_timer('similarity'):
+        ranked = await run_async(similarity_index.top_k, job_descriptions, top_k, doc_ids)
+    
+    return jsonify({
+        'results': [
+            {
+                'job_description': f"jd_{index}",
+                'ranked': [
+                    {'rank': rank, 'resume': name, 'resume_id': doc_id, 'similarity': similarity}
+                    for rank, (doc_id, name, similarity) in enumerate(results, start=1)
+                ]
+            }
+            for index, results in enumerate(ranked, start=1)
+        ],
+        'indexed_resumes': len(similarity_index)
+    })
+
+@app.route('/similarity/stats')
+def similarity_stats():
+    return jsonify(similarity_index.stats())
+
+@app.route('/jd/requirements', methods=['POST'])
+def jd_requirements():
+    payload = request.get_json(silent=True) or request.form
+    job_description = payload.get('job_description', '')
+    if not job_description.strip():
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    entry = jd_cache.lookup(job_description)
+    return jsonify({
+        'fingerprint': entry['digest'],
+        'simhash': f"{entry['simhash']:016x}",
+        'match': entry['match'],
+        'requirements': entry['requirements'],
+        'prompt': entry['prompt'],
+        'original_chars': len(job_description),
+        'prompt_chars': len(entry['prompt'])
+    })
+
+@app.route('/jd/stats')
+def jd_stats():
+    return jsonify(jd_cache.stats())
+
+@app.route('/jobs/analyze-ats', methods=['POST'])
+async def submit_analyze_ats_job():
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No resume file uploaded'}), 400
+    
+    resume_file = request.files['resume']
+    job_description = request.form.get('job_description', '')
+    mode = request.form.get('mode', request.args.get('mode', 'full'))
+    
+    if resume_file.filename == '':
+        return jsonify({'error': 'No resume file selected'}), 400
+    
+    if not job_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    if mode not in ('full', 'single'):
+        return jsonify({'error': 'Invalid mode'}), 400
+    
+    # Extract text now so the upload does not outlive the request
+    resume_text = await process_resume_file(resume_file, app.config['UPLOAD_FOLDER'], text_cache=text_cache)
+    if not resume_text:
+        return jsonify({'error': 'Could not extract text from resume'}), 400
+    
+    try:
+        job = job_queue.submit('analyze_ats', run_ats_job, resume_text, job_description, mode)
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '5'}
+    
+    return jsonify({
+        'job_id': job.id,
+        'status_url': f"/jobs/{job.id}"
+    }), 202
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/stats')
+def job_stats():
+    return jsonify(job_queue.stats())
+
+@app.route('/extraction/stats')
+def extraction_statistics():
+    return jsonify({**extraction_stats(), 'text_cache': text_cache.stats()})
+
+@app.route('/render/stats')
+def render_stats():
+    return jsonify({**rendering_stats(), 'cache': render_cache.stats()})
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/llm/stats')
+def llm_stats():
+    return jsonify(chain_registry.call_stats())
+
+@app.route('/tokens/stats')
+def tokens_stats():
+    return jsonify(token_stats.stats())
+
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(result_cache.stats())
+
 if __name__ == '__main__':
     # Use hypercorn for production ASGI server
     app.run(host='0.0.0.0', port=5000, debug=True)
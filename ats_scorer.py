@@ -0,0 +1,358 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from nltk.stem import PorterStemmer, WordNetLemmatizer
+from nltk.util import ngrams
+
+from resume_sections import parse_resume
+from skills_taxonomy import canonical_skill, find_skills, skill_gap
+
+# Deterministic local ATS scoring. Mirrors the weighting used in the ATS prompt:
+# (Keyword Match * 0.35) + (Section Completion * 0.25) + (Formatting * 0.20)
+# + (Skills Balance * 0.10) + (Proximity * 0.10)
+SCORE_WEIGHTS = {
+    'keyword_match_percentage': 0.35,
+    'section_completion_percentage': 0.25,
+    'formatting_readability_score': 0.20,
+    'hard_soft_skills_balance': 0.10,
+    'proximity_score': 0.10
+}
+
+MAX_KEYWORDS = 40
+MAX_NGRAM = 3
+PROXIMITY_WINDOW = 20
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+SENTENCE_PATTERN = re.compile(r"[.!?;\n•]+")
+PHRASE_BOUNDARY_PATTERN = re.compile(r"[.!?;:,()\[\]\n•]+")
+
+# Bundled so scoring works without downloading NLTK corpora
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each etc few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most my
+myself no nor not now of off on once only or other our ours ourselves out over own same she should so
+some such than that the their theirs them themselves then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your yours
+yourself yourselves able ability across within without including include includes strong excellent
+experience experienced years year plus preferred required requirements responsibilities qualifications
+candidate candidates role position job work working team company join looking seeking ideal must well
+new using use based per like e.g i.e us our who will may help etc opportunity need needs want wants
+""".split())
+
+SOFT_SKILLS = frozenset("""
+communication communicate collaboration collaborate collaborative leadership lead mentor mentoring
+teamwork adaptability adaptable creativity creative problem-solving initiative organization organized
+negotiation presentation interpersonal empathy ownership accountability curiosity flexible flexibility
+stakeholder stakeholders self-motivated detail-oriented critical thinking time management
+""".split())
+
+CORE_SECTIONS = ('summary', 'experience', 'education', 'skills')
+
+# Text normalization
+_stemmer = PorterStemmer()
+_lemmatizer = WordNetLemmatizer()
+
+def _has_wordnet():
+    try:
+        _lemmatizer.lemmatize('tests')
+        return True
+    except LookupError:
+        return False
+
+_USE_WORDNET = _has_wordnet()
+
+@lru_cache(maxsize=50000)
+def normalize_token(token):
+    # WordNet lemmas when the corpus is installed, Porter stems otherwise
+    if not token.isalpha():
+        return token
+    if _USE_WORDNET:
+        return _lemmatizer.lemmatize(token)
+    return _stemmer.stem(token)
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or '').lower())
+
+def _segments(text):
+    # Stopword-free runs between punctuation; keyword n-grams never cross them
+    for fragment in PHRASE_BOUNDARY_PATTERN.split((text or '').lower()):
+        run = []
+        for token in TOKEN_PATTERN.findall(fragment):
+            if token in STOPWORDS or not any(char.isalpha() for char in token):
+                if run:
+                    yield run
+                run = []
+            else:
+                run.append(token)
+        if run:
+            yield run
+
+# Keyword extraction
+def extract_keywords(job_description, max_keywords=MAX_KEYWORDS):
+    counts = Counter()
+    surface = {}
+    list_items = set()
+    for run in _segments(job_description):
+        lemmas = tuple(normalize_token(token) for token in run)
+        if 1 < len(lemmas) <= MAX_NGRAM:
+            # A whole comma/colon separated item such as "machine learning"
+            list_items.add(lemmas)
+        for n in range(1, MAX_NGRAM + 1):
+            for index, gram in enumerate(ngrams(lemmas, n)):
+                counts[gram] += 1
+                surface.setdefault(gram, ' '.join(run[index:index + n]))
+
+    # Multi-word phrases must repeat or be a complete list item to count as keywords
+    kept = {
+        gram: count for gram, count in counts.items()
+        if (len(gram) == 1 and len(gram[0]) > 1) or count > 1 or gram in list_items
+    }
+    # Drop sub-phrases that never occur outside a longer kept phrase
+    for gram, count in list(kept.items()):
+        if len(gram) == 1 or gram not in list_items:
+            continue
+        for n in range(1, len(gram)):
+            for part in ngrams(gram, n):
+                if kept.get(part) == count:
+                    del kept[part]
+
+    scored = sorted(kept.items(), key=lambda item: (-item[1] * len(item[0]), -item[1], surface[item[0]]))
+    return [
+        {'phrase': surface[gram], 'lemmas': gram, 'jd_count': count}
+        for gram, count in scored[:max_keywords]
+    ]
+
+# Vectorized matching
+def _encode(lemmas, vocabulary):
+    return np.fromiter((vocabulary.setdefault(lemma, len(vocabulary)) for lemma in lemmas), dtype=np.int32, count=len(lemmas))
+
+def _phrase_positions(ids, phrase_ids):
+    n = len(phrase_ids)
+    if len(ids) < n:
+        return np.empty(0, dtype=np.int64)
+    mask = ids[:len(ids) - n + 1] == phrase_ids[0]
+    for offset in range(1, n):
+        mask &= ids[offset:len(ids) - n + 1 + offset] == phrase_ids[offset]
+    return np.flatnonzero(mask)
+
+def score_keywords(resume_text, job_description, keywords=None):
+    keywords = keywords if keywords is not None else extract_keywords(job_description)
+    resume_lemmas = [normalize_token(token) for token in tokenize(resume_text)]
+    if not keywords or not resume_lemmas:
+        return {
+            'keyword_match_percentage': 0.0,
+            'keyword_frequency_score': 0.0,
+            'proximity_score': 0.0,
+            'matched_keywords': [],
+            'missing_keywords': [keyword['phrase'] for keyword in keywords]
+        }
+
+    vocabulary = {}
+    resume_ids = _encode(resume_lemmas, vocabulary)
+    positions = [
+        _phrase_positions(resume_ids, _encode(keyword['lemmas'], vocabulary))
+        for keyword in keywords
+    ]
+
+    weights = np.array([len(keyword['lemmas']) for keyword in keywords], dtype=np.float64)
+    jd_counts = np.array([keyword['jd_count'] for keyword in keywords], dtype=np.float64)
+    resume_counts = np.array([len(found) for found in positions], dtype=np.float64)
+    # A taxonomy skill the resume names by an alias ("k8s" for "Kubernetes") counts once
+    resume_skills = find_skills(resume_text)
+    for index, keyword in enumerate(keywords):
+        if not resume_counts[index] and canonical_skill(keyword['phrase']) in resume_skills:
+            resume_counts[index] = 1
+    found = resume_counts > 0
+
+    match = float(weights[found].sum() / weights.sum() * 100)
+    # Frequency saturates once the resume mentions a keyword as often as the JD does
+    frequency = float(np.minimum(resume_counts / np.maximum(jd_counts, 1), 1.0).mean() * 100)
+
+    return {
+        'keyword_match_percentage': round(match, 2),
+        'keyword_frequency_score': round(frequency, 2),
+        'proximity_score': round(_proximity_score(job_description, keywords, positions), 2),
+        'matched_keywords': [keyword['phrase'] for keyword, hit in zip(keywords, found) if hit],
+        'missing_keywords': [keyword['phrase'] for keyword, hit in zip(keywords, found) if not hit]
+    }
+
+def _proximity_score(job_description, keywords, positions):
+    # Keywords that share a JD sentence should also appear near each other in the resume
+    index_by_lemmas = {keyword['lemmas']: index for index, keyword in enumerate(keywords)}
+    pairs = set()
+    for sentence in SENTENCE_PATTERN.split(job_description or ''):
+        present = sorted({
+            index_by_lemmas[gram]
+            for run in _segments(sentence)
+            for n in range(1, MAX_NGRAM + 1)
+            for gram in ngrams(tuple(normalize_token(token) for token in run), n)
+            if gram in index_by_lemmas
+        })
+        pairs.update((a, b) for i, a in enumerate(present) for b in present[i + 1:])
+
+    if not pairs:
+        return 100.0 if any(len(found) for found in positions) else 0.0
+    close = 0
+    for a, b in pairs:
+        if not len(positions[a]) or not len(positions[b]):
+            continue
+        distances = np.abs(np.subtract.outer(positions[a], positions[b]))
+        if distances.min() <= PROXIMITY_WINDOW:
+            close += 1
+    return close / len(pairs) * 100
+
+# Heuristic section, formatting and skills-balance scores
+def score_sections(resume_text):
+    found = parse_resume(resume_text or '').kinds()
+    core = sum(1 for name in CORE_SECTIONS if name in found)
+    extra = len(found - set(CORE_SECTIONS))
+    score = core / len(CORE_SECTIONS) * 90 + min(extra, 2) * 5
+    return round(score, 2), sorted(found), [name for name in CORE_SECTIONS if name not in found]
+
+def score_formatting(resume_text):
+    lines = [line.strip() for line in (resume_text or '').splitlines() if line.strip()]
+    if not lines:
+        return 0.0, ['Resume text could not be read; make sure the file is not image-based']
+
+    issues = []
+    lengths = np.array([len(line) for line in lines])
+    if (lengths > 200).mean() > 0.1:
+        issues.append('Break up long paragraphs into concise bullet points')
+
+    bullet_chars = Counter(line[0] for line in lines if line[0] in '-*•●▪–>')
+    if len(bullet_chars) > 1:
+        issues.append('Use one consistent bullet style throughout the resume')
+
+    date_styles = set()
+    text = resume_text or ''
+    if re.search(r'\b\d{1,2}/\d{4}\b', text):
+        date_styles.add('numeric')
+    if re.search(r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.? \d{4}\b', text, re.I):
+        date_styles.add('month_name')
+    if len(date_styles) > 1:
+        issues.append('Use a single, consistent date format (e.g. MMM YYYY)')
+
+    non_ascii = sum(1 for char in text if ord(char) > 127 and char not in '•–—’“”')
+    if text and non_ascii / len(text) > 0.01:
+        issues.append('Remove special symbols, icons or graphics that ATS parsers may misread')
+
+    if '|' in text and text.count('|') > len(lines) / 2:
+        issues.append('Avoid table or column layouts; use a single-column structure')
+
+    return round(max(100 - 15 * len(issues), 0), 2), issues
+
+def _is_soft(keyword):
+    return any(token in SOFT_SKILLS for token in keyword['phrase'].split())
+
+def score_skills_balance(resume_text, keywords, matched_keywords):
+    # Coverage of the JD's hard and soft skills, weighted equally
+    matched = set(matched_keywords)
+    hard = [keyword for keyword in keywords if not _is_soft(keyword)]
+    soft = [keyword for keyword in keywords if _is_soft(keyword)]
+
+    hard_coverage = sum(1 for keyword in hard if keyword['phrase'] in matched) / len(hard) if hard else 1.0
+    if soft:
+        soft_coverage = sum(1 for keyword in soft if keyword['phrase'] in matched) / len(soft)
+    else:
+        # JD is silent on soft skills; a few mentions in the resume are enough
+        soft_mentions = sum(1 for token in tokenize(resume_text) if token in SOFT_SKILLS)
+        soft_coverage = min(soft_mentions / 3, 1.0)
+
+    score = (hard_coverage + soft_coverage) / 2 * 100
+    return round(score, 2), soft_coverage < hard_coverage
+
+def weighted_total(scores):
+    return sum(scores[name] * weight for name, weight in SCORE_WEIGHTS.items())
+
+# Full local report in the shape of resume_optimization.ATSScore
+def local_ats_analysis(resume_text, job_description):
+    keywords = extract_keywords(job_description)
+    keyword_scores = score_keywords(resume_text, job_description, keywords)
+    section_score, found_sections, missing_sections = score_sections(resume_text)
+    formatting_score, formatting_issues = score_formatting(resume_text)
+    balance_score, needs_soft_skills = score_skills_balance(resume_text, keywords, keyword_scores['matched_keywords'])
+
+    scores = {
+        'keyword_match_percentage': keyword_scores['keyword_match_percentage'],
+        'keyword_frequency_score': keyword_scores['keyword_frequency_score'],
+        'section_completion_percentage': section_score,
+        'formatting_readability_score': formatting_score,
+        'hard_soft_skills_balance': balance_score,
+        'proximity_score': keyword_scores['proximity_score']
+    }
+    total = weighted_total(scores)
+
+    gap = skill_gap(resume_text, job_description)
+    missing = merge_missing_keywords(gap['missing'], keyword_scores['missing_keywords'])
+    searchability = [f"Add the job description term '{phrase}' where it reflects your experience" for phrase in missing[:5]]
+    skills = []
+    if needs_soft_skills:
+        skills.append('Show soft skills (communication, collaboration, leadership) through concrete achievements')
+    if missing:
+        skills.append('List the missing technical skills you genuinely have in a dedicated Skills section')
+    sections = [f"Add a clearly labelled {name.title()} section" for name in missing_sections]
+    synonyms = [
+        f"Mention '{name}' by name; the resume only says '{resume_term}'"
+        for _, resume_term, name in gap['aliases']
+    ]
+    if scores['proximity_score'] < 70:
+        synonyms.append('Place related keywords together in the same bullet to mirror the job description context')
+    if scores['keyword_frequency_score'] < 60:
+        synonyms.append('Repeat key terms and their common variations across summary, skills and experience')
+
+    return {
+        **scores,
+        'total_ats_score': round(total, 2),
+        'missing_keywords': missing,
+        'improvement_suggestions': (searchability[:2] + sections[:1] + formatting_issues[:1] + synonyms[:1]),
+        'searchability_suggestions': searchability,
+        'skills_suggestions': skills,
+        'formatting_suggestions': formatting_issues,
+        'section_suggestions': sections,
+        'synonym_suggestions': synonyms,
+        'searchability_issues_count': len(searchability),
+        'skills_issues_count': len(skills),
+        'formatting_issues_count': len(formatting_issues),
+        'section_issues_count': len(sections),
+        'synonym_issues_count': len(synonyms)
+    }
+
+# Taxonomy-backed missing keywords: canonical skills first, then JD phrases that
+# are neither a known skill nor already covered by one
+def merge_missing_keywords(missing_skills, missing_phrases, resume_text=None):
+    present = find_skills(resume_text) if resume_text is not None else {}
+    merged = list(missing_skills)
+    seen = {phrase.lower() for phrase in merged}
+    for phrase in missing_phrases:
+        skill = canonical_skill(phrase)
+        if skill in present or (skill or phrase).lower() in seen:
+            continue
+        merged.append(skill or phrase)
+        seen.add((skill or phrase).lower())
+    return merged
+
+def reconcile_missing_keywords(missing_keywords, resume_text, job_description):
+    # Applied to LLM reports: skills the resume has under an alias are dropped and
+    # required skills the model overlooked are added
+    return merge_missing_keywords(skill_gap(resume_text, job_description)['missing'], missing_keywords, resume_text)
+
+def format_keyword_metrics(resume_text, job_description):
+    # Compact summary used to pre-fill the LLM ATS prompt
+    scores = score_keywords(resume_text, job_description)
+    gap = skill_gap(resume_text, job_description)
+    missing = merge_missing_keywords(gap['missing'], scores['missing_keywords'])
+    lines = [
+        f"Keyword match: {scores['keyword_match_percentage']}%",
+        f"Keyword frequency score: {scores['keyword_frequency_score']}",
+        f"Proximity score: {scores['proximity_score']}",
+        f"Matched keywords: {', '.join(scores['matched_keywords']) or 'none'}",
+        f"Missing keywords: {', '.join(missing) or 'none'}"
+    ]
+    if gap['aliases']:
+        lines.append("Skills present under another name: " + ', '.join(
+            f"{name} ('{resume_term}' in resume)" for _, resume_term, name in gap['aliases']
+        ))
+    return '\n'.join(lines)
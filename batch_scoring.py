@@ -0,0 +1,195 @@
+import os
+import io
+import csv
+import sys
+import json
+import asyncio
+import hashlib
+import argparse
+
+from result_cache import normalize_text
+from ats_scorer import local_ats_analysis
+
+RESULT_FIELDS = [
+    'job_description', 'rank', 'resume', 'total_ats_score', 'keyword_match_percentage',
+    'keyword_frequency_score', 'proximity_score', 'similarity', 'missing_keywords', 'error'
+]
+
+def fingerprint(text):
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+def dedupe(named_texts):
+    # Identical documents (after whitespace normalization) are scored once
+    unique = {}
+    refs = []
+    for name, text in named_texts:
+        digest = fingerprint(text)
+        unique.setdefault(digest, text)
+        refs.append((name, digest))
+    return unique, refs
+
+async def fast_score(resume_text, job_description):
+    return await asyncio.to_thread(local_ats_analysis, resume_text, job_description)
+
+async def rank_batch(resumes, job_descriptions, score_pair=fast_score, concurrency=4):
+    # resumes / job_descriptions: [(name, text)]. Yields one ranked list of rows per
+    # job description, in the order the job descriptions finish scoring.
+    unique_resumes, resume_refs = dedupe(resumes)
+    unique_jds, jd_refs = dedupe(job_descriptions)
+    semaphore = asyncio.Semaphore(concurrency)
+    pair_tasks = {}
+
+    async def score(resume_digest, jd_digest):
+        async with semaphore:
+            return await score_pair(unique_resumes[resume_digest], unique_jds[jd_digest])
+
+    def pair(resume_digest, jd_digest):
+        key = (resume_digest, jd_digest)
+        if key not in pair_tasks:
+            pair_tasks[key] = asyncio.ensure_future(score(resume_digest, jd_digest))
+        return pair_tasks[key]
+
+    async def rank_for(jd_name, jd_digest):
+        results = await asyncio.gather(
+            *(pair(resume_digest, jd_digest) for _, resume_digest in resume_refs),
+            return_exceptions=True
+        )
+        rows = []
+        for (resume_name, _), result in zip(resume_refs, results):
+            row = {'job_description': jd_name, 'resume': resume_name}
+            if isinstance(result, Exception):
+                row.update(total_ats_score=None, error=str(result))
+            else:
+                row.update(
+                    total_ats_score=result['total_ats_score'],
+                    keyword_match_percentage=result['keyword_match_percentage'],
+                    keyword_frequency_score=result['keyword_frequency_score'],
+                    proximity_score=result['proximity_score'],
+                    missing_keywords=result['missing_keywords']
+                )
+            rows.append(row)
+
+        # Failed pairs sink to the bottom
+        rows.sort(key=lambda row: (row['total_ats_score'] is None, -(row['total_ats_score'] or 0), row['resume']))
+        for rank, row in enumerate(rows, start=1):
+            row['rank'] = rank
+        return rows
+
+    tasks = [asyncio.ensure_future(rank_for(jd_name, jd_digest)) for jd_name, jd_digest in jd_refs]
+    try:
+        for next_ranked in asyncio.as_completed(tasks):
+            yield await next_ranked
+    finally:
+        for task in [*tasks, *pair_tasks.values()]:
+            task.cancel()
+
+def rank_by_similarity(resumes, job_descriptions, index=None, top_k=None):
+    # Vector similarity instead of per-pair scoring: every resume is encoded once
+    # and each job description is ranked with a single matrix multiply
+    from similarity import SimilarityIndex
+    index = index if index is not None else SimilarityIndex()
+    doc_ids = index.add_many(resumes)
+    names = [name for name, _ in resumes]
+    # Duplicate uploads share a row; rank by row and expand back to every name
+    unique_ids = list(dict.fromkeys(doc_ids))
+    names_by_id = {}
+    for name, doc_id in zip(names, doc_ids):
+        names_by_id.setdefault(doc_id, []).append(name)
+    ranked = index.top_k([text for _, text in job_descriptions], k=len(unique_ids), doc_ids=unique_ids)
+    for (jd_name, _), results in zip(job_descriptions, ranked):
+        rows = [
+            {'job_description': jd_name, 'resume': name, 'similarity': similarity}
+            for doc_id, _, similarity in results
+            for name in names_by_id[doc_id]
+        ]
+        rows = rows[:top_k] if top_k else rows
+        for rank, row in enumerate(rows, start=1):
+            row['rank'] = rank
+        yield rows
+
+# Output formats
+class RowSerializer:
+    def __init__(self, output_format='ndjson'):
+        self.output_format = output_format
+        self._header_written = False
+
+    def __call__(self, row):
+        if self.output_format != 'csv':
+            return json.dumps(row) + '\n'
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+        if not self._header_written:
+            writer.writeheader()
+            self._header_written = True
+        writer.writerow({
+            **row,
+            'missing_keywords': '; '.join(row.get('missing_keywords') or [])
+        })
+        return buffer.getvalue()
+
+# Command line entry point
+async def _load_resume(path):
+    from resume_optimization import extract_text_from_pdf, extract_text_from_docx
+    if path.endswith('.pdf'):
+        return await extract_text_from_pdf(path)
+    if path.endswith(('.docx', '.doc')):
+        return await extract_text_from_docx(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _llm_scorer():
+    from dotenv import load_dotenv
+    from resume_optimization import ChainRegistry
+    from ats_scorer import format_keyword_metrics
+    from jd_cache import create_jd_cache
+
+    load_dotenv()
+    registry = ChainRegistry(os.getenv("OPENAI_API_KEY"))
+    # Each posting's requirement set is extracted once for the whole batch
+    jd_cache = create_jd_cache()
+
+    async def score(resume_text, job_description):
+        result = await registry.ainvoke('ats_analysis', {
+            "resume_text": resume_text,
+            "job_description": jd_cache.lookup(job_description)['prompt'],
+            "keyword_metrics": format_keyword_metrics(resume_text, job_description)
+        })
+        return result.model_dump()
+    return score
+
+async def _run_cli(args):
+    resume_texts = await asyncio.gather(*(_load_resume(path) for path in args.resumes))
+    resumes = [(os.path.basename(path), text) for path, text in zip(args.resumes, resume_texts)]
+    job_descriptions = []
+    for path in args.job_descriptions:
+        with open(path, 'r', encoding='utf-8') as f:
+            job_descriptions.append((os.path.basename(path), f.read()))
+
+    serializer = RowSerializer(args.format)
+    if args.mode == 'similarity':
+        from similarity import create_similarity_index
+        for rows in rank_by_similarity(resumes, job_descriptions, create_similarity_index(), top_k=args.top_k):
+            for row in rows:
+                sys.stdout.write(serializer(row))
+        sys.stdout.flush()
+        return
+
+    score_pair = fast_score if args.mode == 'fast' else _llm_scorer()
+    async for rows in rank_batch(resumes, job_descriptions, score_pair, concurrency=args.concurrency):
+        for row in rows:
+            sys.stdout.write(serializer(row))
+        sys.stdout.flush()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank resumes against job descriptions by ATS score")
+    parser.add_argument('--resumes', nargs='+', required=True, help="Resume files (.pdf, .docx or .txt)")
+    parser.add_argument('--job-descriptions', nargs='+', required=True, help="Job description text files")
+    parser.add_argument('--mode', choices=['fast', 'llm', 'similarity'], default='fast')
+    parser.add_argument('--top-k', type=int, default=None, help="Only keep the best K resumes per job description (similarity mode)")
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv("BATCH_CONCURRENCY", "4")))
+    asyncio.run(_run_cli(parser.parse_args(argv)))
+
+if __name__ == '__main__':
+    main()
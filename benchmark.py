@@ -0,0 +1,466 @@
+import os
+import io
+import sys
+import re
+import json
+import time
+import random
+import typing
+import asyncio
+import hashlib
+import argparse
+import platform
+import resource
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pydantic import BaseModel
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
+
+from document_rendering import render_docx, render_pdf
+
+# Offline benchmark: every route in app.py under concurrent load, with ChatOpenAI
+# replaced by a deterministic local model and synthetic resumes / job descriptions.
+
+# Deterministic stand-in for ChatOpenAI
+def _words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+def sample_value(annotation, rng, output_words):
+    origin = typing.get_origin(annotation)
+    if annotation is float:
+        return round(rng.uniform(40, 95), 2)
+    if annotation is int:
+        return rng.randint(0, 5)
+    if annotation is str:
+        # Long free-text fields (resume, cover letter) use blank-line separated paragraphs
+        paragraphs = max(1, output_words // 40)
+        return '\n\n'.join(_words(rng, max(1, output_words // paragraphs)).capitalize() + '.' for _ in range(paragraphs))
+    if origin is list:
+        return [_words(rng, 6) for _ in range(3)]
+    if origin is dict:
+        _, value_type = typing.get_args(annotation)
+        return {_words(rng, 3): sample_value(value_type, rng, output_words) for _ in range(2)}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return sample_model(annotation, rng, output_words)
+    return None
+
+def sample_model(model, rng, output_words):
+    sample = {name: sample_value(field.annotation, rng, output_words) for name, field in model.model_fields.items()}
+    if {'improved_summary', 'improved_bullets', 'improved_resume_text'} <= set(sample):
+        sample['improved_resume_text'] = optimized_resume_text(sample)
+    return sample
+
+def optimized_resume_text(sample):
+    # The full resume embeds the generated summary and bullets under standard
+    # headings, as a real model's does, so /regenerate-section can splice into it
+    lines = ["Jordan Example", "jordan@example.com | 555-0100", "", "SUMMARY", sample['improved_summary'], "", "EXPERIENCE"]
+    for index, (role, bullets) in enumerate(sample['improved_bullets'].items()):
+        lines.append(f"{role.title()}, Company {index + 1} (20{10 + index} - 20{11 + index})")
+        lines.extend(f"- {bullet}" for bullet in bullets)
+        lines.append("")
+    lines += ["SKILLS", ', '.join(sample['suggested_skills'])]
+    return '\n'.join(lines)
+
+SCHEMA_PATTERN = re.compile(r"Here is the output schema:\s*```\s*(\{.*?\})\s*```", re.DOTALL)
+
+def pick_output_model(output_models, prompt):
+    # PydanticOutputParser embeds the expected JSON schema; match its top-level properties
+    match = SCHEMA_PATTERN.search(prompt)
+    if match:
+        properties = set(json.loads(match.group(1)).get('properties', {}))
+        for model in output_models:
+            if set(model.model_fields) == properties:
+                return model
+    return output_models[0]
+
+class FakeChatModel(BaseChatModel):
+    output_models: list
+    latency: float = 0.05
+    jitter: float = 0.0
+    output_words: int = 200
+    seed: int = 0
+    chunk_size: int = 16
+    tail_rate: float = 0.0
+    tail_latency: float = 0.0
+    model_name: str = "fake-benchmark"
+    temperature: float = 0.0
+
+    @property
+    def _llm_type(self):
+        return "fake-benchmark"
+
+    def _respond(self, messages):
+        prompt = '\n'.join(str(message.content) for message in messages)
+        rng = random.Random(f"{self.seed}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()}")
+        model = pick_output_model(self.output_models, prompt)
+        delay = max(0.0, self.latency * (1 + rng.uniform(-self.jitter, self.jitter)))
+        # Tail stalls are drawn per call, not per prompt, like a degraded provider
+        if self.tail_rate and random.random() < self.tail_rate:
+            delay += self.tail_latency
+        return json.dumps(sample_model(model, rng, self.output_words)), delay
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        content, delay = self._respond(messages)
+        time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        content, delay = self._respond(messages)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        content, delay = self._respond(messages)
+        time.sleep(delay)
+        for start in range(0, len(content), self.chunk_size):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content[start:start + self.chunk_size]))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        content, delay = self._respond(messages)
+        await asyncio.sleep(delay)
+        for start in range(0, len(content), self.chunk_size):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content[start:start + self.chunk_size]))
+
+def fake_llm_factory(output_models, **options):
+    def factory(api_key, **kwargs):
+        return FakeChatModel(output_models=output_models, **options)
+    return factory
+
+# Synthetic documents
+WORDS = """
+python java kubernetes docker aws azure sql postgres redis kafka spark airflow terraform linux react
+typescript graphql rest microservices ci/cd agile scrum leadership mentoring communication analytics
+pipelines latency throughput reliability monitoring incident design architecture migration testing
+automation security compliance stakeholders roadmap delivery performance scalability data models
+""".split()
+
+SKILLS = WORDS[:24]
+
+SIZES = {
+    # name: (roles, bullets per role, requirements in the job description)
+    'small': (2, 3, 6),
+    'medium': (4, 6, 12),
+    'large': (8, 10, 25)
+}
+
+def synthetic_resume(rng, size):
+    roles, bullets, _ = SIZES[size]
+    lines = ["Jordan Example", "jordan@example.com | 555-0100", "", "SUMMARY", _words(rng, 40).capitalize() + ".", "", "EXPERIENCE"]
+    for role in range(roles):
+        lines.append(f"Senior Engineer, Company {role + 1} (20{10 + role} - 20{11 + role})")
+        lines.extend(f"- {_words(rng, 14).capitalize()}." for _ in range(bullets))
+        lines.append("")
+    lines += ["SKILLS", ', '.join(rng.sample(SKILLS, 12)), "", "EDUCATION", "B.Sc. Computer Science, Example University"]
+    return '\n'.join(lines)
+
+def synthetic_job_description(rng, size, boilerplate=True):
+    _, _, requirements = SIZES[size]
+    lines = ["Senior Software Engineer", "", "Requirements:"]
+    lines.extend(f"- {rng.randint(2, 8)}+ years with {' and '.join(rng.sample(SKILLS, 2))}" for _ in range(requirements))
+    lines += ["", "Responsibilities:"]
+    lines.extend(f"- {_words(rng, 10).capitalize()}" for _ in range(requirements // 2 + 1))
+    if boilerplate:
+        lines += [
+            "", "Benefits", "- Health, dental and vision insurance", "- 401(k) matching", "",
+            "We are an equal opportunity employer and consider all applicants without regard to race, "
+            "color, religion, sex, sexual orientation, gender identity or protected veteran status."
+        ]
+    return '\n'.join(lines)
+
+def synthetic_corpus(seed, sizes):
+    # One PDF and one DOCX resume plus a job description per size
+    rng = random.Random(seed)
+    resumes = []
+    job_descriptions = []
+    for size in sizes:
+        text = synthetic_resume(rng, size)
+        resumes.append((f"resume_{size}.pdf", render_pdf(text, 'resume')))
+        resumes.append((f"resume_{size}.docx", render_docx(text, 'resume')))
+        job_descriptions.append(synthetic_job_description(rng, size))
+    return resumes, job_descriptions
+
+# Memory sampling
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is KiB on Linux and bytes on macOS; either way it is a peak, not current usage
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+class RssSampler:
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+SSE_ERROR = re.compile(r"^event: error$", re.MULTILINE)
+
+# Route scenarios: each call(client, index) issues one request and returns the response
+class Benchmark:
+    def __init__(self, app_module, resumes, job_descriptions):
+        self.app_module = app_module
+        self.resumes = resumes
+        self.job_descriptions = job_descriptions
+        self.sessions = []
+
+    def upload(self, index, **fields):
+        name, data = self.resumes[index % len(self.resumes)]
+        # A per-request suffix keeps the LLM result cache cold
+        job_description = f"{self.job_descriptions[index % len(self.job_descriptions)]}\n\nRequisition {index}"
+        return {'resume': (io.BytesIO(data), name), 'job_description': job_description, **fields}
+
+    def session(self, index):
+        return self.sessions[index % len(self.sessions)]
+
+    def setup(self, client, count=4):
+        for index in range(count):
+            response = client.post('/analyze-all', data=self.upload(index))
+            self.sessions.append(response.get_json()['session_id'])
+
+    def poll_job(self, client, response, timeout=60):
+        if response.status_code != 202:
+            return response
+        status_url = response.get_json()['status_url']
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = client.get(status_url)
+            if status.get_json()['state'] in ('completed', 'failed'):
+                return status
+            time.sleep(0.01)
+        return status
+
+    def scenarios(self):
+        return {
+            'index': lambda client, i: client.get('/'),
+            'analyze_ats': lambda client, i: client.post('/analyze-ats', data=self.upload(i)),
+            'analyze_ats_single': lambda client, i: client.post('/analyze-ats', data=self.upload(i, mode='single')),
+            'analyze_ats_fast': lambda client, i: client.post('/analyze-ats', data=self.upload(i, mode='fast')),
+            'analyze_ats_stream': lambda client, i: client.post('/analyze-ats/stream', data=self.upload(i)),
+            'generate_cover_letter': lambda client, i: client.post('/generate-cover-letter', data=self.upload(i)),
+            'generate_cover_letter_stream': lambda client, i: client.post('/generate-cover-letter/stream', data=self.upload(i)),
+            'analyze_all': lambda client, i: client.post('/analyze-all', data=self.upload(i)),
+            'analyze_all_single': lambda client, i: client.post('/analyze-all', data=self.upload(i, mode='single')),
+            'regenerate_ats': lambda client, i: client.post(f'/regenerate-ats/{self.session(i)}'),
+            'regenerate_section': lambda client, i: client.post(f'/regenerate-section/{self.session(i)}', json={'sections': ['summary']}),
+            'regenerate_cover_letter': lambda client, i: client.post(f'/regenerate-cover-letter/{self.session(i)}'),
+            'preview_resume': lambda client, i: client.get(f'/preview/resume/{self.session(i)}'),
+            'preview_cover_letter': lambda client, i: client.get(f'/preview/cover_letter/{self.session(i)}'),
+            'download_resume_pdf': lambda client, i: client.get(f'/download/pdf/resume/{self.session(i)}'),
+            'download_resume_docx': lambda client, i: client.get(f'/download/docx/resume/{self.session(i)}'),
+            'download_cover_letter_pdf': lambda client, i: client.get(f'/download/pdf/cover_letter/{self.session(i)}'),
+            'batch_ats_score': lambda client, i: client.post('/batch/ats-score', data={
+                'resumes': [(io.BytesIO(data), name) for name, data in self.resumes],
+                'job_descriptions': self.job_descriptions,
+                'mode': 'fast'
+            }),
+            'similarity_rank': lambda client, i: client.post('/similarity/rank', data={
+                'resumes': [(io.BytesIO(data), name) for name, data in self.resumes],
+                'job_descriptions': self.job_descriptions
+            }),
+            # No uploads: queries the resumes already in the index
+            'similarity_rank_indexed': lambda client, i: client.post('/similarity/rank', data={
+                'job_descriptions': self.job_descriptions
+            }),
+            'similarity_stats': lambda client, i: client.get('/similarity/stats'),
+            # Repeats the corpus postings, so most lookups are exact cache hits
+            'jd_requirements': lambda client, i: client.post('/jd/requirements', json={
+                'job_description': self.job_descriptions[i % len(self.job_descriptions)]
+            }),
+            'jd_stats': lambda client, i: client.get('/jd/stats'),
+            'jobs_analyze_ats': lambda client, i: self.poll_job(client, client.post('/jobs/analyze-ats', data=self.upload(i))),
+            'score': lambda client, i: client.get(f'/score/{self.session(i)}'),
+            'score_stream': lambda client, i: client.get(f'/score/{self.session(i)}/stream'),
+            'jobs_stats': lambda client, i: client.get('/jobs/stats'),
+            'extraction_stats': lambda client, i: client.get('/extraction/stats'),
+            'render_stats': lambda client, i: client.get('/render/stats'),
+            'tokens_stats': lambda client, i: client.get('/tokens/stats'),
+            'cache_stats': lambda client, i: client.get('/cache/stats'),
+            'metrics': lambda client, i: client.get('/metrics'),
+            'llm_stats': lambda client, i: client.get('/llm/stats')
+        }
+
+    def run_route(self, call, requests, concurrency):
+        flask_app = self.app_module.app
+
+        def one(index):
+            client = flask_app.test_client()
+            started = time.perf_counter()
+            try:
+                response = call(client, index)
+                body = response.get_data()  # drain streamed bodies
+                ok = response.status_code < 400 and (
+                    response.get_json(silent=True) or {}
+                ).get('state', 'completed') != 'failed'
+                # SSE routes answer 200 and report failures in the stream;
+                # other bodies (PDF, DOCX) are binary and are not decoded
+                if response.mimetype == 'text/event-stream':
+                    ok = ok and not SSE_ERROR.search(body.decode('utf-8', errors='replace'))
+            except Exception:
+                ok = False
+            return time.perf_counter() - started, ok
+
+        rss_start = rss_bytes()
+        started = time.perf_counter()
+        with RssSampler() as sampler, ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(requests)))
+        elapsed = time.perf_counter() - started
+
+        latencies = np.array([seconds for seconds, _ in results]) * 1000
+        return {
+            'requests': requests,
+            'concurrency': concurrency,
+            'errors': sum(1 for _, ok in results if not ok),
+            'duration_seconds': round(elapsed, 4),
+            'throughput_rps': round(requests / elapsed, 2) if elapsed else None,
+            'latency_ms': {
+                'p50': round(float(np.percentile(latencies, 50)), 2),
+                'p90': round(float(np.percentile(latencies, 90)), 2),
+                'p99': round(float(np.percentile(latencies, 99)), 2),
+                'mean': round(float(latencies.mean()), 2),
+                'max': round(float(latencies.max()), 2)
+            },
+            'memory_mb': {
+                'rss_start': round(rss_start / 2 ** 20, 1),
+                'rss_end': round(rss_bytes() / 2 ** 20, 1),
+                'rss_peak': round(sampler.peak / 2 ** 20, 1)
+            }
+        }
+
+# Reports
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_reports(baseline, report):
+    # Relative change per route: positive throughput / negative p99 is better
+    rows = []
+    for route, current in report['routes'].items():
+        previous = baseline.get('routes', {}).get(route)
+        if not previous:
+            continue
+        def change(old, new):
+            return round((new - old) / old * 100, 1) if old else None
+        rows.append({
+            'route': route,
+            'throughput_change_pct': change(previous['throughput_rps'], current['throughput_rps']),
+            'p99_change_pct': change(previous['latency_ms']['p99'], current['latency_ms']['p99'])
+        })
+    return rows
+
+def run(args):
+    # The app is imported here so process-pool workers re-importing this module stay light
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    import app as app_module
+    from resume_optimization import CHAIN_FACTORIES
+
+    # The fake imitates whichever output model each chain's parser expects
+    output_models = [
+        factory(None, llm=FakeChatModel(output_models=[])).last.pydantic_object
+        for factory in CHAIN_FACTORIES.values()
+    ]
+    # Chains are built lazily, so swapping the factory before the first request is enough
+    app_module.chain_registry.llm_factory = fake_llm_factory(
+        output_models,
+        latency=args.llm_latency,
+        jitter=args.llm_jitter,
+        output_words=args.output_words,
+        seed=args.seed,
+        tail_rate=args.llm_tail_rate,
+        tail_latency=args.llm_tail_latency
+    )
+
+    resumes, job_descriptions = synthetic_corpus(args.seed, args.sizes)
+    benchmark = Benchmark(app_module, resumes, job_descriptions)
+    benchmark.setup(app_module.app.test_client())
+
+    scenarios = benchmark.scenarios()
+    selected = args.routes or list(scenarios)
+    unknown = [route for route in selected if route not in scenarios]
+    if unknown:
+        raise SystemExit(f"Unknown routes: {', '.join(unknown)}")
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': {
+                'requests': args.requests,
+                'concurrency': args.concurrency,
+                'llm_latency': args.llm_latency,
+                'llm_jitter': args.llm_jitter,
+                'llm_tail_rate': args.llm_tail_rate,
+                'llm_tail_latency': args.llm_tail_latency,
+                'output_words': args.output_words,
+                'sizes': args.sizes,
+                'seed': args.seed
+            }
+        },
+        'routes': {}
+    }
+    for route in selected:
+        report['routes'][route] = benchmark.run_route(scenarios[route], args.requests, args.concurrency)
+        print(f"{route}: {report['routes'][route]['throughput_rps']} req/s, "
+              f"p99 {report['routes'][route]['latency_ms']['p99']} ms", file=sys.stderr)
+
+    # Backend calls, hedges and breaker state behind the routes above
+    report['llm_routing'] = app_module.chain_registry.router.stats()
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['comparison'] = compare_reports(json.load(f), report)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every route with a fake LLM backend")
+    parser.add_argument('--requests', type=int, default=40, help="Requests per route")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--llm-latency', type=float, default=0.05, help="Seconds per fake model call")
+    parser.add_argument('--llm-jitter', type=float, default=0.2, help="Latency jitter as a fraction of --llm-latency")
+    parser.add_argument('--llm-tail-rate', type=float, default=0.0, help="Fraction of fake model calls that stall")
+    parser.add_argument('--llm-tail-latency', type=float, default=1.0, help="Extra seconds a stalled call takes")
+    parser.add_argument('--output-words', type=int, default=250, help="Words per free-text output field")
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--routes', nargs='+', help="Only run these scenarios")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help="Earlier report to compare against")
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
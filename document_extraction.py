@@ -0,0 +1,115 @@
+import os
+import time
+import asyncio
+import threading
+from io import BytesIO
+
+import PyPDF2
+import docx
+
+from worker_pool import BoundedProcessPool
+
+PAGES_PER_TASK = int(os.getenv("EXTRACTION_PAGES_PER_TASK", "8"))
+MAX_PAGES = int(os.getenv("EXTRACTION_MAX_PAGES", "50"))
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "30"))
+
+class ExtractionLimitError(Exception):
+    pass
+
+class ExtractionResult:
+    def __init__(self, text, page_timings, elapsed):
+        self.text = text
+        self.page_timings = page_timings
+        self.elapsed = elapsed
+
+# Worker functions (run inside the process pool, so they must stay module-level).
+# source is either the document bytes or the path of a spilled upload.
+def _open_source(source):
+    return source if isinstance(source, str) else BytesIO(source)
+
+def extract_pdf_pages(source, start, stop):
+    # Returns (page_count, [(page_index, text, seconds)]) for pages [start, stop)
+    reader = PyPDF2.PdfReader(_open_source(source))
+    page_count = len(reader.pages)
+    pages = []
+    for index in range(start, min(stop, page_count)):
+        started = time.perf_counter()
+        text = reader.pages[index].extract_text() or ""
+        pages.append((index, text, time.perf_counter() - started))
+    return page_count, pages
+
+def extract_docx_text(source):
+    started = time.perf_counter()
+    doc = docx.Document(_open_source(source))
+    text = '\n'.join(para.text for para in doc.paragraphs)
+    return text, time.perf_counter() - started
+
+# Pool and aggregate statistics
+extraction_pool = BoundedProcessPool(
+    'extraction',
+    max_workers=int(os.getenv("EXTRACTION_WORKERS", "0")) or None,
+    max_pending=int(os.getenv("EXTRACTION_MAX_PENDING", "0")) or None
+)
+
+_stats_lock = threading.Lock()
+_stats = {'documents': 0, 'pages': 0, 'parse_seconds': 0.0, 'slowest_page_seconds': 0.0, 'limit_errors': 0}
+
+def _record(result, pages):
+    with _stats_lock:
+        _stats['documents'] += 1
+        _stats['pages'] += pages
+        _stats['parse_seconds'] += result.elapsed
+        if result.page_timings:
+            _stats['slowest_page_seconds'] = max(
+                _stats['slowest_page_seconds'], max(seconds for _, seconds in result.page_timings)
+            )
+
+def extraction_stats():
+    with _stats_lock:
+        return {**_stats, 'pool': extraction_pool.stats()}
+
+# Async extraction API
+async def extract_pdf(source, pages_per_task=PAGES_PER_TASK, max_pages=MAX_PAGES, timeout=EXTRACTION_TIMEOUT):
+    started = time.perf_counter()
+
+    async def run():
+        # The first task also reports the page count; remaining chunks fan out across workers
+        page_count, pages = await extraction_pool.run(extract_pdf_pages, source, 0, pages_per_task)
+        if page_count > max_pages:
+            with _stats_lock:
+                _stats['limit_errors'] += 1
+            raise ExtractionLimitError(f"PDF has {page_count} pages; the limit is {max_pages}")
+        chunks = await asyncio.gather(*(
+            extraction_pool.run(extract_pdf_pages, source, start, start + pages_per_task)
+            for start in range(pages_per_task, page_count, pages_per_task)
+        ))
+        for _, chunk_pages in chunks:
+            pages.extend(chunk_pages)
+        return pages
+
+    try:
+        pages = await asyncio.wait_for(run(), timeout)
+    except asyncio.TimeoutError:
+        with _stats_lock:
+            _stats['limit_errors'] += 1
+        raise ExtractionLimitError(f"PDF extraction took longer than {timeout} seconds")
+    pages.sort(key=lambda page: page[0])
+    result = ExtractionResult(
+        ''.join(text for _, text, _ in pages),
+        [(index, round(seconds, 6)) for index, _, seconds in pages],
+        time.perf_counter() - started
+    )
+    _record(result, len(pages))
+    return result
+
+async def extract_docx(source, timeout=EXTRACTION_TIMEOUT):
+    started = time.perf_counter()
+    try:
+        text, _ = await extraction_pool.run(extract_docx_text, source, timeout=timeout)
+    except asyncio.TimeoutError:
+        with _stats_lock:
+            _stats['limit_errors'] += 1
+        raise ExtractionLimitError(f"DOCX extraction took longer than {timeout} seconds")
+    result = ExtractionResult(text, [], time.perf_counter() - started)
+    _record(result, 0)
+    return result
@@ -0,0 +1,107 @@
+import os
+import time
+import asyncio
+import threading
+from io import BytesIO
+
+from docx import Document as DocxDocument
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+from worker_pool import BoundedProcessPool
+from resume_sections import parse_resume
+
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", "20"))
+FILE_TYPES = ('docx', 'pdf')
+
+class RenderTimeoutError(Exception):
+    pass
+
+# Worker functions (run inside the process pool, so they must stay module-level)
+def _blocks(content, document_type):
+    # Yields (is_heading, text). Resumes are walked section by section from the
+    # parsed offsets; cover letters keep the paragraph heuristic
+    if document_type == 'resume':
+        document = parse_resume(content)
+        if document.headings():
+            for section in document.sections:
+                if section.heading is not None:
+                    yield True, section.heading.text
+                for paragraph in section.body.text.split('\n\n'):
+                    if paragraph.strip():
+                        yield False, paragraph
+            return
+    for section in content.split('\n\n'):
+        if section.strip():
+            yield len(section) < 50 and section.isupper() or ':' in section and len(section.split(':')[0]) < 20, section
+
+def render_docx(content, document_type):
+    doc = DocxDocument()
+    for is_heading, text in _blocks(content, document_type):
+        if is_heading and document_type == 'resume':
+            doc.add_heading(text, level=1)
+        else:
+            doc.add_paragraph(text)
+    file_obj = BytesIO()
+    doc.save(file_obj)
+    return file_obj.getvalue()
+
+def render_pdf(content, document_type):
+    file_obj = BytesIO()
+    doc = SimpleDocTemplate(file_obj, pagesize=letter)
+    styles = getSampleStyleSheet()
+    story = []
+    normal_style = styles['Normal']
+    heading_style = styles['Heading1']
+
+    for is_heading, text in _blocks(content, document_type):
+        story.append(Paragraph(text, heading_style if is_heading else normal_style))
+        story.append(Spacer(1, 12))
+
+    doc.build(story)
+    return file_obj.getvalue()
+
+RENDERERS = {
+    'docx': render_docx,
+    'pdf': render_pdf
+}
+
+def render_formats(content, document_type, file_types):
+    # Batch mode: one task renders every requested format, returns {file_type: (bytes, seconds)}
+    rendered = {}
+    for file_type in file_types:
+        started = time.perf_counter()
+        rendered[file_type] = (RENDERERS[file_type](content, document_type), time.perf_counter() - started)
+    return rendered
+
+# Pool and aggregate statistics
+render_pool = BoundedProcessPool(
+    'render',
+    max_workers=int(os.getenv("RENDER_WORKERS", "2")),
+    max_pending=int(os.getenv("RENDER_MAX_PENDING", "0")) or None,
+    timeout=RENDER_TIMEOUT
+)
+
+_stats_lock = threading.Lock()
+_stats = {'documents': 0, 'render_seconds': 0.0, 'timeouts': 0}
+
+def rendering_stats():
+    with _stats_lock:
+        return {**_stats, 'pool': render_pool.stats()}
+
+# Async rendering API
+async def render_documents(content, document_type, file_types=FILE_TYPES, timeout=None):
+    try:
+        rendered = await render_pool.run(render_formats, content, document_type, tuple(file_types), timeout=timeout)
+    except asyncio.TimeoutError:
+        with _stats_lock:
+            _stats['timeouts'] += 1
+        raise RenderTimeoutError(f"Rendering {document_type} took longer than {timeout or render_pool.timeout} seconds")
+    with _stats_lock:
+        _stats['documents'] += len(rendered)
+        _stats['render_seconds'] += sum(seconds for _, seconds in rendered.values())
+    return {file_type: data for file_type, (data, _) in rendered.items()}
+
+async def render_document(content, document_type, file_type, timeout=None):
+    return (await render_documents(content, document_type, (file_type,), timeout=timeout))[file_type]
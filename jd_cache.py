@@ -0,0 +1,255 @@
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from result_cache import MemoryCacheTier, SQLiteCacheTier, ResultCache
+from token_budget import strip_boilerplate, HEADING_LINE
+from skills_taxonomy import find_skills
+from ats_scorer import extract_keywords
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+MAX_OTHER_TERMS = 12
+
+# Normalization and fingerprints
+BULLET_MARKERS = re.compile(r"^\s*(?:[-•*●▪–]|\d+[.)])\s*", re.MULTILINE)
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+def normalize_job_description(job_description):
+    # Boilerplate (benefits, EEO, company blurb) is dropped and whitespace
+    # squeezed, so re-pasted copies of one posting normalize identically
+    text = strip_boilerplate(job_description) or (job_description or '')
+    lines = [' '.join(line.split()) for line in text.replace('\r\n', '\n').split('\n')]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+def exact_digest(normalized):
+    return hashlib.sha256(BULLET_MARKERS.sub('', normalized).lower().encode('utf-8')).hexdigest()
+
+def simhash(normalized):
+    # 64-bit SimHash over word 3-shingles; near-identical postings differ in a few bits
+    words = WORD_PATTERN.findall(normalized.lower())
+    shingles = [' '.join(words[index:index + SHINGLE_SIZE]) for index in range(max(len(words) - SHINGLE_SIZE + 1, 1))]
+    hashes = np.array([
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        for shingle in shingles
+    ], dtype=np.uint64)
+    bits = (hashes[:, None] >> np.arange(SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(hashes)
+    return sum(1 << int(bit) for bit in np.flatnonzero(votes > 0))
+
+# Requirement extraction
+REQUIRED_CUES = re.compile(
+    r"\b(?:requirements?|required|must|minimum|qualifications|what you(?:'ll)? need|you have|you bring|essential)\b", re.IGNORECASE
+)
+PREFERRED_CUES = re.compile(
+    r"\b(?:preferred|preferably|nice[- ]to[- ]have|bonus|a plus|desired|desirable|ideally|good to have)\b", re.IGNORECASE
+)
+TITLE_WORDS = re.compile(
+    r"\b(?:engineer|developer|manager|analyst|scientist|designer|specialist|consultant|lead|architect|"
+    r"administrator|director|coordinator|intern|associate|officer|representative|technician)\b", re.IGNORECASE
+)
+TITLE_PATTERNS = [
+    re.compile(r"^\s*(?:job\s+)?title\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE),
+    re.compile(r"\b(?:looking for|hiring|seeking)\s+(?:an?\s+)?((?:[A-Z][\w/+#.-]*\s+){0,4}[A-Z][\w/+#.-]*)"),
+]
+CERTIFICATION_PATTERN = re.compile(
+    r"\b(?:PMP|CISSP|CISA|CISM|CPA|CFA|CKA|CKAD|CCNA|CCNP|CSM|PSM|ITIL|Security\+|CompTIA [A-Z][\w+]*|"
+    r"(?:AWS|Azure|Google(?: Cloud)?|GCP|Microsoft|Salesforce|Oracle) Certified(?: [A-Z][\w-]*){0,4}|"
+    r"(?:[A-Z][\w+-]* ){1,4}[Cc]ertification)\b"
+)
+# Words that only frame a requirement and carry no matching signal of their own
+FRAMING_WORDS = frozenset(
+    'nice plus bonus preferred required requirement requirements experience year years strong skill skills '
+    'ability knowledge understanding familiarity proficiency proficient certified certification'.split()
+)
+YEARS_PATTERN = re.compile(r"(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+
+def _titles(normalized):
+    titles = []
+    first_line = next((line.strip() for line in normalized.splitlines() if line.strip()), '')
+    if len(first_line) < 80 and TITLE_WORDS.search(first_line) and not first_line.endswith('.'):
+        titles.append(first_line.rstrip(':'))
+    for pattern in TITLE_PATTERNS:
+        for match in pattern.finditer(normalized):
+            title = match.group(1).strip().rstrip('.,:')
+            if TITLE_WORDS.search(title) and title.lower() not in {existing.lower() for existing in titles}:
+                titles.append(title)
+    return titles[:3]
+
+def _overall_years(normalized):
+    # "7+ years overall ... 2+ years of Kubernetes" asks for 7: years on lines that
+    # name no skill describe overall experience; otherwise the largest figure wins
+    overall, per_skill = [], []
+    for line in normalized.splitlines():
+        years = [int(match.group(1)) for match in YEARS_PATTERN.finditer(line)]
+        if years:
+            (per_skill if find_skills(line) else overall).extend(years)
+    years = overall or per_skill
+    return max(years) if years else None
+
+def extract_requirements(normalized):
+    # Skills under "Requirements"-style headings (or in lines with such cues) are
+    # required, under "Nice to have"-style ones preferred; skills without any cue
+    # count as required
+    required, preferred = {}, {}
+    mode = 'required'
+    for line in normalized.splitlines():
+        if not line.strip():
+            continue
+        # Short label lines ("Nice to have:", "REQUIREMENTS") switch the mode for
+        # the lines below them
+        is_heading = len(line) < 80 and (
+            line.rstrip().endswith(':') or (bool(HEADING_LINE.match(line)) and len(line.split()) <= 4 and not find_skills(line))
+        )
+        if PREFERRED_CUES.search(line):
+            line_mode = 'preferred'
+        elif REQUIRED_CUES.search(line):
+            line_mode = 'required'
+        else:
+            line_mode = mode
+        if is_heading:
+            mode = line_mode if (PREFERRED_CUES.search(line) or REQUIRED_CUES.search(line)) else 'required'
+        for skill in find_skills(line):
+            (preferred if line_mode == 'preferred' else required).setdefault(skill, None)
+    preferred = [skill for skill in preferred if skill not in required]
+
+    titles = _titles(normalized)
+    certifications = list(dict.fromkeys(match.group(0).strip() for match in CERTIFICATION_PATTERN.finditer(normalized)))
+    # Remaining JD keywords not already said by a skill, title or certification
+    covered = FRAMING_WORDS | {word for phrase in (*titles, *certifications) for word in phrase.lower().split()}
+    other_terms = [
+        keyword['phrase'] for keyword in extract_keywords(normalized)
+        if not set(keyword['phrase'].lower().split()) <= covered and not find_skills(keyword['phrase'])
+    ][:MAX_OTHER_TERMS]
+
+    return {
+        'titles': titles,
+        'required_skills': list(required),
+        'preferred_skills': preferred,
+        'certifications': certifications,
+        'min_years_experience': _overall_years(normalized),
+        'other_terms': other_terms
+    }
+
+def format_requirements(requirements):
+    # Compact stand-in for the full posting in the ATS prompt
+    lines = []
+    if requirements['titles']:
+        lines.append(f"Title: {' / '.join(requirements['titles'])}")
+    lines.append(f"Required skills: {', '.join(requirements['required_skills']) or 'none listed'}")
+    if requirements['preferred_skills']:
+        lines.append(f"Preferred skills: {', '.join(requirements['preferred_skills'])}")
+    if requirements['certifications']:
+        lines.append(f"Certifications: {', '.join(requirements['certifications'])}")
+    if requirements['min_years_experience'] is not None:
+        lines.append(f"Experience: {requirements['min_years_experience']}+ years")
+    if requirements['other_terms']:
+        lines.append(f"Other key terms: {', '.join(requirements['other_terms'])}")
+    return '\n'.join(lines)
+
+# Cache: exact digest -> requirement set, plus an in-process SimHash table that
+# finds near-duplicate postings (edited dates, reordered perks)
+REQUIREMENT_FIELDS = ('required_skills', 'preferred_skills', 'certifications', 'min_years_experience')
+
+def _same_requirements(first, second):
+    return all(
+        (set(first[field]) == set(second[field])) if isinstance(first[field], list) else first[field] == second[field]
+        for field in REQUIREMENT_FIELDS
+    )
+
+class JobDescriptionCache:
+    def __init__(self, cache, max_fingerprints=1024, max_distance=3):
+        self.cache = cache
+        self.max_fingerprints = max_fingerprints
+        self.max_distance = max_distance
+        self._fingerprints = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'exact_hits': 0, 'near_hits': 0, 'near_changed': 0, 'misses': 0}
+
+    def _nearest(self, fingerprint):
+        with self._lock:
+            if not self._fingerprints:
+                return None
+            digests = list(self._fingerprints)
+            known = np.fromiter(self._fingerprints.values(), dtype=np.uint64, count=len(digests))
+        # Popcount via unpackbits, which unlike np.bitwise_count predates NumPy 2
+        distances = np.unpackbits((known ^ np.uint64(fingerprint)).view(np.uint8)).reshape(-1, SIMHASH_BITS).sum(axis=1)
+        best = int(np.argmin(distances))
+        return digests[best] if distances[best] <= self.max_distance else None
+
+    def _remember(self, digest, fingerprint):
+        with self._lock:
+            self._fingerprints[digest] = fingerprint
+            self._fingerprints.move_to_end(digest)
+            while len(self._fingerprints) > self.max_fingerprints:
+                self._fingerprints.popitem(last=False)
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def lookup(self, job_description):
+        # Returns this posting's cached entry, extracting and storing its
+        # requirement set on a miss
+        normalized = normalize_job_description(job_description)
+        digest = exact_digest(normalized)
+        entry = self.cache.get(digest)
+        if entry is not None:
+            self._count('exact_hits')
+            self._remember(digest, entry['simhash'])
+            return {**entry, 'match': 'exact'}
+
+        # Extraction is local and cheap, so it always runs: an edit of a few words
+        # can add a requirement. A near duplicate with the same requirements reuses
+        # that entry's requirement set, so both postings send an identical prompt
+        # and share LLM cache entries.
+        fingerprint = simhash(normalized)
+        requirements = extract_requirements(normalized)
+        match = 'new'
+        near_digest = self._nearest(fingerprint)
+        near = self.cache.get(near_digest) if near_digest is not None else None
+        if near is not None:
+            if _same_requirements(near['requirements'], requirements):
+                requirements, match = near['requirements'], 'near'
+            else:
+                match = 'near_changed'
+        self._count({'new': 'misses', 'near': 'near_hits', 'near_changed': 'near_changed'}[match])
+
+        entry = {
+            'digest': digest,
+            'simhash': fingerprint,
+            'requirements': requirements,
+            'prompt': format_requirements(requirements),
+            'normalized_chars': len(normalized)
+        }
+        self.cache.set(digest, entry)
+        self._remember(digest, fingerprint)
+        return {**entry, 'match': match}
+
+    def stats(self):
+        with self._lock:
+            lookups = sum(self._counters.values())
+            return {
+                **self._counters,
+                'hit_rate': round((self._counters['exact_hits'] + self._counters['near_hits']) / lookups, 4) if lookups else 0.0,
+                'fingerprints': len(self._fingerprints),
+                'cache': self.cache.stats()
+            }
+
+def create_jd_cache(max_entries=None, ttl=None, db_path=None):
+    max_entries = max_entries or int(os.getenv("JD_CACHE_SIZE", "512"))
+    ttl = ttl if ttl is not None else int(os.getenv("JD_CACHE_TTL", str(7 * 86400)))
+    db_path = db_path or os.getenv("JD_CACHE_DB")
+
+    tiers = [MemoryCacheTier(max_entries=max_entries, ttl=ttl)]
+    if db_path:
+        tiers.append(SQLiteCacheTier(db_path, ttl=ttl))
+    return JobDescriptionCache(
+        ResultCache(tiers),
+        max_fingerprints=max_entries * 2,
+        max_distance=int(os.getenv("JD_SIMHASH_DISTANCE", "3"))
+    )
@@ -0,0 +1,117 @@
+import os
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict
+
+class QueueFullError(Exception):
+    pass
+
+class Job:
+    def __init__(self, kind):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.state = 'queued'
+        self.result = {}
+        self.error = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.stage_timings = {}
+
+    def update(self, **partial_results):
+        # Partial results become visible to pollers as soon as each stage finishes
+        self.result = {**self.result, **partial_results}
+
+    def record_stage(self, stage, seconds):
+        self.stage_timings[stage] = round(seconds, 4)
+
+    def to_dict(self):
+        now = time.time()
+        timings = {
+            'queued_seconds': round((self.started_at or now) - self.queued_at, 4),
+            'stages': dict(self.stage_timings)
+        }
+        if self.started_at is not None:
+            timings['running_seconds'] = round((self.finished_at or now) - self.started_at, 4)
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'state': self.state,
+            'result': self.result,
+            'error': self.error,
+            'timings': timings
+        }
+
+class JobQueue:
+    def __init__(self, event_loop, concurrency=None, max_depth=None, retention=None):
+        self.event_loop = event_loop
+        self.concurrency = concurrency or int(os.getenv("JOB_CONCURRENCY", "4"))
+        self.max_depth = max_depth or int(os.getenv("JOB_QUEUE_DEPTH", "32"))
+        self.retention = retention or int(os.getenv("JOB_RETENTION", "1000"))
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._semaphore = None
+        self._counters = {'submitted': 0, 'rejected': 0, 'completed': 0, 'failed': 0}
+        self._queued = 0
+        self._running = 0
+
+    def submit(self, kind, func, *args):
+        # func is a coroutine function called as func(job, *args) on the worker loop
+        with self._lock:
+            if self._queued >= self.max_depth:
+                self._counters['rejected'] += 1
+                raise QueueFullError(f"Job queue is full ({self.max_depth} waiting)")
+            job = Job(kind)
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._counters['submitted'] += 1
+            self._evict_finished()
+        self.event_loop.submit(self._run(job, func, args))
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    async def _run(self, job, func, args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            job.state = 'running'
+            job.started_at = time.time()
+            try:
+                await func(job, *args)
+                job.state = 'completed'
+                counter = 'completed'
+            except Exception as e:
+                job.state = 'failed'
+                job.error = str(e)
+                counter = 'failed'
+            finally:
+                job.finished_at = time.time()
+            with self._lock:
+                self._running -= 1
+                self._counters[counter] += 1
+
+    def _evict_finished(self):
+        # Oldest finished jobs go first; queued and running jobs are never dropped
+        excess = len(self._jobs) - self.retention
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished_at is not None][:excess]:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                'queued': self._queued,
+                'running': self._running,
+                'concurrency': self.concurrency,
+                'max_depth': self.max_depth
+            }
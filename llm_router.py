@@ -0,0 +1,444 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+# Routing across LLM backends (LLM_BACKENDS): failover in configured order,
+# a hedged second request once a call outlives the backend's recent p95, and a
+# circuit breaker per backend on its recent error rate
+LLM_HEDGE = os.getenv("LLM_HEDGE", "true").lower() in ('1', 'true', 'yes')
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.1"))
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "500"))
+LLM_BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", "20"))
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "10"))
+LLM_BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+class LLMUnavailableError(Exception):
+    pass
+
+def backend_configs(api_key, model_name):
+    # LLM_BACKENDS=openai,local with LLM_BACKEND_<NAME>_BASE_URL / _MODEL / _API_KEY.
+    # A backend without a base URL talks to OpenAI; a local OpenAI-compatible server
+    # (vLLM, llama.cpp, Ollama) only needs its /v1 URL.
+    configs = []
+    for name in os.getenv("LLM_BACKENDS", "openai").split(','):
+        name = name.strip()
+        if not name:
+            continue
+        prefix = f"LLM_BACKEND_{name.upper().replace('-', '_')}_"
+        configs.append({
+            'name': name,
+            'base_url': os.getenv(prefix + "BASE_URL") or None,
+            'model_name': os.getenv(prefix + "MODEL") or model_name,
+            'api_key': os.getenv(prefix + "API_KEY") or api_key
+        })
+    return configs
+
+def _percentile(values, quantile):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+def _valid(result):
+    # A backend that answers with no text counts as failed, so the next one is tried
+    return bool(result.generations) and bool(result.generations[0].text.strip())
+
+class CircuitBreaker:
+    # closed -> open once the error rate over the last `window` calls reaches
+    # error_rate; after `cooldown` seconds one probe call is let through
+    # (half_open) and its outcome closes or re-opens the breaker
+    def __init__(self, window=None, min_calls=None, error_rate=None, cooldown=None):
+        self.outcomes = deque(maxlen=window or LLM_BREAKER_WINDOW)
+        self.min_calls = min_calls or LLM_BREAKER_MIN_CALLS
+        self.error_rate = error_rate or LLM_BREAKER_ERROR_RATE
+        self.cooldown = cooldown if cooldown is not None else LLM_BREAKER_COOLDOWN
+        self.state = 'closed'
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+
+    def current(self, now):
+        if self.state == 'open' and now - self.opened_at >= self.cooldown:
+            return 'half_open'
+        return self.state
+
+    def available(self, now):
+        state = self.current(now)
+        return state == 'closed' or (state == 'half_open' and not self.probing)
+
+    def acquire(self, now):
+        if not self.available(now):
+            return False
+        if self.current(now) == 'half_open':
+            self.state = 'half_open'
+            self.probing = True
+        return True
+
+    def release(self):
+        self.probing = False
+
+    def record(self, ok, now):
+        self.outcomes.append(ok)
+        if self.state == 'half_open':
+            self.probing = False
+            if ok:
+                self.state = 'closed'
+                self.outcomes.clear()
+            else:
+                self._trip(now)
+        elif self.state == 'closed' and len(self.outcomes) >= self.min_calls \
+                and self.outcomes.count(False) / len(self.outcomes) >= self.error_rate:
+            self._trip(now)
+
+    def _trip(self, now):
+        self.state = 'open'
+        self.opened_at = now
+        self.trips += 1
+
+    def recent_error_rate(self):
+        return round(self.outcomes.count(False) / len(self.outcomes), 4) if self.outcomes else 0.0
+
+class LLMRouter:
+    # Shared by every chain and kept across chain rebuilds, so latency history
+    # and breaker state survive a SIGHUP reload
+    def __init__(self, hedge=None, hedge_quantile=None, hedge_min_samples=None, hedge_budget=None, latency_window=None):
+        self.hedge = LLM_HEDGE if hedge is None else hedge
+        self.hedge_quantile = hedge_quantile or LLM_HEDGE_QUANTILE
+        self.hedge_min_samples = hedge_min_samples or LLM_HEDGE_MIN_SAMPLES
+        self.hedge_budget = LLM_HEDGE_BUDGET if hedge_budget is None else hedge_budget
+        self.latency_window = latency_window or LLM_LATENCY_WINDOW
+        self._lock = threading.Lock()
+        self._backends = {}
+        self._chain_latencies = {}
+        self._recent_hedges = deque(maxlen=100)
+        self._counters = {'routed': 0, 'hedges_throttled': 0, 'unavailable': 0}
+
+    def _state(self, name):
+        # Caller holds the lock
+        state = self._backends.get(name)
+        if state is None:
+            state = self._backends[name] = {
+                'breaker': CircuitBreaker(),
+                'latencies': deque(maxlen=self.latency_window),
+                'counters': {
+                    'calls': 0, 'errors': 0, 'timeouts': 0, 'failovers': 0,
+                    'hedges': 0, 'hedge_wins': 0, 'short_circuited': 0
+                }
+            }
+        return state
+
+    def _count(self, name, counter):
+        with self._lock:
+            self._state(name)['counters'][counter] += 1
+
+    def candidates(self, names):
+        now = time.monotonic()
+        available = []
+        with self._lock:
+            for name in names:
+                state = self._state(name)
+                if state['breaker'].available(now):
+                    available.append(name)
+                else:
+                    state['counters']['short_circuited'] += 1
+        return available
+
+    def _acquire(self, name):
+        with self._lock:
+            return self._state(name)['breaker'].acquire(time.monotonic())
+
+    def _release(self, name):
+        with self._lock:
+            self._state(name)['breaker'].release()
+
+    def _record(self, name, chain_name, ok, seconds=None, timeout=False):
+        with self._lock:
+            state = self._state(name)
+            state['breaker'].record(ok, time.monotonic())
+            if not ok:
+                state['counters']['timeouts' if timeout else 'errors'] += 1
+            if seconds is not None:
+                self._record_latency(name, chain_name, seconds)
+
+    def _record_latency(self, name, chain_name, seconds):
+        # Caller holds the lock
+        self._state(name)['latencies'].append(seconds)
+        key = (name, chain_name)
+        if key not in self._chain_latencies:
+            self._chain_latencies[key] = deque(maxlen=self.latency_window)
+        self._chain_latencies[key].append(seconds)
+
+    def hedge_delay(self, name, chain_name):
+        # Seconds to wait before hedging: the quantile of this chain's recent
+        # latencies on this backend, or None until there are enough samples
+        if not self.hedge:
+            return None
+        with self._lock:
+            samples = list(self._chain_latencies.get((name, chain_name), ()))
+            if len(samples) < self.hedge_min_samples:
+                return None
+            # Hedges are capped at a fraction of recent calls so a provider-wide
+            # slowdown cannot double the load on it
+            if sum(self._recent_hedges) > self.hedge_budget * len(self._recent_hedges):
+                self._counters['hedges_throttled'] += 1
+                return None
+        return _percentile(samples, self.hedge_quantile)
+
+    def _routed(self):
+        with self._lock:
+            self._counters['routed'] += 1
+
+    def _unavailable(self, names):
+        with self._lock:
+            self._counters['unavailable'] += 1
+        return LLMUnavailableError(f"No LLM backend available ({', '.join(names)} circuit open)")
+
+    async def _attempt(self, name, chain_name, call):
+        started = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            self._release(name)
+            raise
+        except Exception:
+            self._record(name, chain_name, ok=False)
+            raise
+        if not _valid(result):
+            self._record(name, chain_name, ok=False)
+            raise ValueError(f"LLM backend {name} returned an empty response")
+        self._record(name, chain_name, ok=True, seconds=time.monotonic() - started)
+        return result
+
+    async def agenerate(self, backends, chain_name, call):
+        # backends is [(name, chat model)]; call(model) returns a fresh awaitable.
+        # The first backend that can take the call starts it; a hedge goes to the
+        # next available backend (or the same one when it is the only one), and
+        # a failed attempt fails over to the next untried backend.
+        models = dict(backends)
+        order = [name for name, _ in backends]
+        pending = {}
+        tried = []
+        hedged = False
+        winner = None
+        last_error = None
+        self._routed()
+
+        def launch(kind):
+            for name in self.candidates(order):
+                # With a single backend the hedge goes to the same provider
+                if name in tried and not (kind == 'hedge' and len(order) == 1):
+                    continue
+                if not self._acquire(name):
+                    continue
+                tried.append(name)
+                task = asyncio.ensure_future(self._attempt(name, chain_name, lambda name=name: call(models[name])))
+                pending[task] = (name, kind, time.monotonic())
+                self._count(name, 'calls')
+                if kind != 'primary':
+                    self._count(name, kind + 's')
+                return name
+            return None
+
+        primary = launch('primary')
+        if primary is None:
+            raise self._unavailable(order)
+        delay = self.hedge_delay(primary, chain_name)
+        primary_started = time.monotonic()
+        try:
+            while pending:
+                timeout = None
+                if not hedged and delay is not None:
+                    timeout = max(0.0, delay - (time.monotonic() - primary_started))
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    launch('hedge')
+                    continue
+                for task in done:
+                    name, kind, _ = pending.pop(task)
+                    if task.exception() is None:
+                        winner = (task.result(), name, kind)
+                        break
+                    last_error = task.exception()
+                if winner is not None:
+                    break
+                if not pending and launch('failover') is None:
+                    break
+        except asyncio.CancelledError:
+            # The caller's timeout fired: whatever is still running counts against its backend
+            for name, _, _ in pending.values():
+                self._record(name, chain_name, ok=False, timeout=True)
+            raise
+        finally:
+            now = time.monotonic()
+            for task, (name, _, started) in pending.items():
+                task.cancel()
+                if winner is not None:
+                    # A hedge loser ran at least this long; keeping it as a sample
+                    # stops the quantile from drifting down to only the fast calls
+                    with self._lock:
+                        self._record_latency(name, chain_name, now - started)
+            with self._lock:
+                self._recent_hedges.append(hedged)
+
+        if winner is None:
+            raise last_error or self._unavailable(order)
+        result, name, kind = winner
+        if kind == 'hedge':
+            self._count(name, 'hedge_wins')
+        return result
+
+    def generate(self, backends, chain_name, call):
+        # Synchronous path: failover only, no hedging
+        models = dict(backends)
+        order = [name for name, _ in backends]
+        last_error = None
+        self._routed()
+        for position, name in enumerate(self.candidates(order)):
+            if not self._acquire(name):
+                continue
+            self._count(name, 'calls')
+            if position:
+                self._count(name, 'failovers')
+            started = time.monotonic()
+            try:
+                result = call(models[name])
+            except Exception as e:
+                self._record(name, chain_name, ok=False)
+                last_error = e
+                continue
+            if not _valid(result):
+                self._record(name, chain_name, ok=False)
+                last_error = ValueError(f"LLM backend {name} returned an empty response")
+                continue
+            self._record(name, chain_name, ok=True, seconds=time.monotonic() - started)
+            return result
+        raise last_error or self._unavailable(order)
+
+    async def astream(self, backends, chain_name, stream):
+        # Streams fail over only before their first chunk; once tokens have reached
+        # the client, switching backends would splice two different answers
+        models = dict(backends)
+        order = [name for name, _ in backends]
+        last_error = None
+        self._routed()
+        for position, name in enumerate(self.candidates(order)):
+            if not self._acquire(name):
+                continue
+            self._count(name, 'calls')
+            if position:
+                self._count(name, 'failovers')
+            streamed = False
+            try:
+                async for chunk in stream(models[name]):
+                    streamed = True
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                self._release(name)
+                raise
+            except Exception as e:
+                self._record(name, chain_name, ok=False)
+                if streamed:
+                    raise
+                last_error = e
+                continue
+            # Stream duration includes the consumer, so it is not a latency sample
+            self._record(name, chain_name, ok=True)
+            return
+        raise last_error or self._unavailable(order)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            backends = {}
+            for name, state in self._backends.items():
+                latencies = list(state['latencies'])
+                backends[name] = {
+                    **state['counters'],
+                    'state': state['breaker'].current(now),
+                    'error_rate': state['breaker'].recent_error_rate(),
+                    'trips': state['breaker'].trips,
+                    'latency_ms': {
+                        label: round(_percentile(latencies, quantile) * 1000, 1)
+                        for label, quantile in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+                    } if latencies else None,
+                    'hedge_after_ms': {
+                        chain_name or 'unknown': round(_percentile(samples, self.hedge_quantile) * 1000, 1)
+                        for (backend, chain_name), samples in self._chain_latencies.items()
+                        if backend == name and len(samples) >= self.hedge_min_samples
+                    }
+                }
+            return {
+                **self._counters,
+                'hedging': self.hedge,
+                'hedge_quantile': self.hedge_quantile,
+                'hedge_rate': round(sum(self._recent_hedges) / len(self._recent_hedges), 4) if self._recent_hedges else 0.0,
+                'backends': backends
+            }
+
+class RoutedChatModel(BaseChatModel):
+    # The chat model the chain factories receive: every call is routed across
+    # the configured backends by the shared LLMRouter
+    backends: list
+    router: Any
+
+    @property
+    def _llm_type(self):
+        return "routed"
+
+    @property
+    def primary(self):
+        return self.backends[0][1]
+
+    # Read by the result cache key and the token counter
+    @property
+    def model_name(self):
+        return getattr(self.primary, 'model_name', None)
+
+    @property
+    def temperature(self):
+        return getattr(self.primary, 'temperature', None)
+
+    @property
+    def _identifying_params(self):
+        return {'backends': [name for name, _ in self.backends], 'model_name': self.model_name}
+
+    def _combine_llm_outputs(self, llm_outputs):
+        # Keeps the primary backend's token_usage format for the metrics callback
+        return self.primary._combine_llm_outputs(llm_outputs)
+
+    @staticmethod
+    def _chain_name(run_manager):
+        return (getattr(run_manager, 'metadata', None) or {}).get('chain_name')
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self.router.generate(
+            self.backends, self._chain_name(run_manager),
+            lambda llm: llm._generate(messages, stop=stop, **kwargs)
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return await self.router.agenerate(
+            self.backends, self._chain_name(run_manager),
+            lambda llm: llm._agenerate(messages, stop=stop, **kwargs)
+        )
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        # Synchronous streaming is unused by the app; take the first available backend
+        name = next(iter(self.router.candidates([name for name, _ in self.backends])), None)
+        if name is None:
+            raise LLMUnavailableError("No LLM backend available")
+        yield from dict(self.backends)[name]._stream(messages, stop=stop, **kwargs)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async for chunk in self.router.astream(
+            self.backends, self._chain_name(run_manager),
+            lambda llm: llm._astream(messages, stop=stop, **kwargs)
+        ):
+            yield chunk
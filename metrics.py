@@ -0,0 +1,168 @@
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues)) + list(extra or [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value):
+    return repr(float(value)) if value != float('inf') else '+Inf'
+
+# Minimal Prometheus text-format metrics, kept in process like the other stats
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield f"{self.name}_total{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *labelvalues):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def samples(self):
+        with self._lock:
+            series = {labelvalues: (list(counts), total, count) for labelvalues, (counts, total, count) in self._series.items()}
+        for labelvalues, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float('inf')), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, labelvalues, [('le', _format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.register(Histogram(
+    'resume_stage_seconds', 'Latency of request pipeline stages', ['stage']
+))
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    'http_request_seconds', 'Time to produce a response (streamed bodies excluded)', ['endpoint', 'method', 'status']
+))
+LLM_REQUEST_SECONDS = registry.register(Histogram(
+    'llm_request_seconds', 'Model call latency per chain', ['chain']
+))
+LLM_TOKENS = registry.register(Counter(
+    'llm_tokens', 'Tokens reported by the model per chain', ['chain', 'kind']
+))
+LLM_ERRORS = registry.register(Counter(
+    'llm_errors', 'Failed model calls per chain', ['chain']
+))
+
+def stage_timer(stage):
+    return STAGE_SECONDS.time(stage)
+
+# LangChain callback: model latency and token usage, labelled by the chain_name
+# metadata that ChainRegistry attaches to every run
+class LLMMetricsCallback(BaseCallbackHandler):
+    def __init__(self):
+        self._started = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, metadata):
+        with self._lock:
+            self._started[run_id] = (time.perf_counter(), (metadata or {}).get('chain_name', 'unknown'))
+
+    def _finish(self, run_id):
+        with self._lock:
+            return self._started.pop(run_id, (None, 'unknown'))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._start(run_id, metadata)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        started, chain_name = self._finish(run_id)
+        if started is not None:
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, chain_name)
+
+        prompt_tokens, completion_tokens = _token_usage(response)
+        if prompt_tokens:
+            LLM_TOKENS.inc(chain_name, 'prompt', amount=prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.inc(chain_name, 'completion', amount=completion_tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        _, chain_name = self._finish(run_id)
+        LLM_ERRORS.inc(chain_name)
+
+def _token_usage(response):
+    # OpenAI reports usage in llm_output; streamed runs carry it on the message instead
+    usage = (response.llm_output or {}).get('token_usage') or {}
+    if usage:
+        return usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0)
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage_metadata = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or {}
+            prompt_tokens += usage_metadata.get('input_tokens', 0)
+            completion_tokens += usage_metadata.get('output_tokens', 0)
+    return prompt_tokens, completion_tokens
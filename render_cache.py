@@ -0,0 +1,61 @@
+import os
+import hashlib
+import threading
+
+from result_cache import MemoryCacheTier, ResultCache
+from metrics import stage_timer
+from document_rendering import FILE_TYPES, render_documents
+
+MIMETYPES = {
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'pdf': 'application/pdf'
+}
+
+def content_hash(content):
+    return hashlib.sha256((content or '').encode('utf-8')).hexdigest()
+
+def document_etag(document_type, file_type, content):
+    # Derived from the source text, so every worker agrees on it without rendering
+    return f"{document_type}-{file_type}-{content_hash(content)[:32]}"
+
+# Rendered DOCX/PDF bytes keyed by (session, document type, file type, content hash).
+# Regenerating a document changes its hash, so stale renders simply age out of the LRU.
+class RenderedDocumentCache:
+    def __init__(self, max_entries=None, ttl=None):
+        max_entries = max_entries or int(os.getenv("RENDER_CACHE_SIZE", "64"))
+        ttl = ttl if ttl is not None else int(os.getenv("RENDER_CACHE_TTL", "3600"))
+        self.cache = ResultCache([MemoryCacheTier(max_entries=max_entries, ttl=ttl)])
+        self._lock = threading.Lock()
+        self._prerendered = 0
+
+    @staticmethod
+    def key(session_id, document_type, file_type, content):
+        return f"{session_id}:{document_type}:{file_type}:{content_hash(content)}"
+
+    async def render(self, session_id, document_type, file_type, content):
+        return (await self.render_many(session_id, document_type, (file_type,), content))[file_type]
+
+    async def render_many(self, session_id, document_type, file_types, content):
+        # Formats missing from the cache are rendered together in one pool task
+        rendered = {}
+        for file_type in file_types:
+            data = self.cache.get(self.key(session_id, document_type, file_type, content))
+            if data is not None:
+                rendered[file_type] = data
+        missing = [file_type for file_type in file_types if file_type not in rendered]
+        if missing:
+            with stage_timer('render'):
+                documents = await render_documents(content, document_type, missing)
+            for file_type, data in documents.items():
+                self.cache.set(self.key(session_id, document_type, file_type, content), data)
+                rendered[file_type] = data
+        return rendered
+
+    async def prerender(self, session_id, document_type, content):
+        await self.render_many(session_id, document_type, FILE_TYPES, content)
+        with self._lock:
+            self._prerendered += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self.cache.stats(), 'prerendered': self._prerendered}
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Key helpers
+def normalize_text(text):
+    # Collapse whitespace so re-extracted copies of the same document hash identically
+    return ' '.join((text or '').split())
+
+def make_cache_key(namespace, inputs, template='', model_params=None):
+    payload = {
+        'namespace': namespace,
+        'inputs': {
+            name: normalize_text(value) if isinstance(value, str) else value
+            for name, value in inputs.items()
+        },
+        'template': template,
+        'model_params': model_params or {}
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def chain_cache_key(chain, inputs, namespace=None):
+    # Works on the prompt | llm | parser sequences built in resume_optimization.py
+    prompt = chain.first
+    llm = chain.middle[0] if chain.middle else None
+    partials = {
+        name: value() if callable(value) else value
+        for name, value in getattr(prompt, 'partial_variables', {}).items()
+    }
+    model_params = {}
+    if llm is not None:
+        model_params = {
+            'model_name': getattr(llm, 'model_name', None),
+            'temperature': getattr(llm, 'temperature', None)
+        }
+    if namespace is None:
+        output_model = getattr(chain.last, 'pydantic_object', None)
+        namespace = output_model.__name__ if output_model is not None else ''
+    return make_cache_key(
+        namespace,
+        inputs,
+        template=getattr(prompt, 'template', '') + json.dumps(partials, sort_keys=True, default=str),
+        model_params=model_params
+    )
+
+# Cache tiers
+class MemoryCacheTier:
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteCacheTier:
+    def __init__(self, path, ttl=86400):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(value)
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+# Tiered cache with hit/miss accounting
+class ResultCache:
+    def __init__(self, tiers):
+        self.tiers = list(tiers)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'sets': 0}
+        self._tier_hits = [0] * len(self.tiers)
+
+    def get(self, key):
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                # Promote to the faster tiers so the next lookup stays in memory
+                for faster in self.tiers[:index]:
+                    faster.set(key, value)
+                with self._lock:
+                    self._stats['hits'] += 1
+                    self._tier_hits[index] += 1
+                return value
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def set(self, key, value):
+        for tier in self.tiers:
+            tier.set(key, value)
+        with self._lock:
+            self._stats['sets'] += 1
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'tier_hits': {
+                    type(tier).__name__: hits
+                    for tier, hits in zip(self.tiers, self._tier_hits)
+                }
+            }
+
+def create_result_cache(max_entries=None, ttl=None, db_path=None):
+    max_entries = max_entries or int(os.getenv("RESULT_CACHE_SIZE", "256"))
+    ttl = ttl if ttl is not None else int(os.getenv("RESULT_CACHE_TTL", "3600"))
+    db_path = db_path or os.getenv("RESULT_CACHE_DB")
+
+    tiers = [MemoryCacheTier(max_entries=max_entries, ttl=ttl)]
+    if db_path:
+        tiers.append(SQLiteCacheTier(db_path, ttl=int(os.getenv("RESULT_CACHE_DB_TTL", "86400"))))
+    return ResultCache(tiers)
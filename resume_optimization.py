@@ -1,7 +1,11 @@
 import os
 import asyncio
-import PyPDF2
-import docx
+import queue
+import hashlib
+import tempfile
+import threading
+import httpx
+from contextlib import asynccontextmanager
 from datetime import datetime
 from io import BytesIO
 from werkzeug.utils import secure_filename
@@ -9,12 +13,14 @@ from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain_core.runnables.base import RunnableSequence
 from langchain.output_parsers import PydanticOutputParser
+from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 from typing import List, Dict
-from docx import Document as DocxDocument
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from document_rendering import render_document
+from document_extraction import extract_pdf, extract_docx
+from metrics import LLMMetricsCallback, stage_timer
+from llm_router import LLMRouter, RoutedChatModel, backend_configs
+from text_cache import HASH_CHUNK_SIZE, content_digest, normalize_extracted_text
 
 # Define Pydantic models
 class ATSScore(BaseModel):
@@ -48,49 +54,92 @@ class ResumeOptimization(BaseModel):
 class CoverLetterOutput(BaseModel):
     cover_letter_text: str = Field(description="Complete cover letter text")
 
-# File processing functions
-async def extract_text_from_pdf(file_path):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _sync_extract_text_from_pdf, file_path)
-
-def _sync_extract_text_from_pdf(file_path):
-    text = ""
-    with open(file_path, 'rb') as file:
-        pdf_reader = PyPDF2.PdfReader(file)
-        for page in pdf_reader.pages:
-            text += page.extract_text() or ""  
-    return text
-
-async def extract_text_from_docx(file_path):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _sync_extract_text_from_docx, file_path)
+class ATSAnalysisAndOptimization(BaseModel):
+    ats_analysis: ATSScore = Field(description="ATS compatibility analysis of the original resume")
+    optimization: ResumeOptimization = Field(description="Optimized resume based on that analysis")
 
-def _sync_extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    full_text = [para.text for para in doc.paragraphs]
-    return '\n'.join(full_text)
+class SectionRewrite(BaseModel):
+    improved_text: str = Field(description="Rewritten section: the summary paragraph, or one bullet per line for an experience block")
 
-# Simplify the file processing
-async def process_resume_file(file, upload_folder):
+# File processing functions
+UPLOAD_SPILL_THRESHOLD = int(os.getenv("UPLOAD_SPILL_THRESHOLD", str(2 * 1024 * 1024)))
+
+async def extract_text_from_pdf(source):
+    # Parsing runs in the extraction process pool, split by page across workers.
+    # source is the document bytes or a file path.
+    return (await extract_pdf(source)).text
+
+async def extract_text_from_docx(source):
+    return (await extract_docx(source)).text
+
+def _ingest_upload(file, upload_folder, spill_threshold):
+    # Small uploads are parsed straight from memory; large ones are spilled to a
+    # uniquely named temp file so the bytes are not copied into every worker task.
+    # Returns (source, spill_path, sha256 of the bytes).
+    stream = file.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    if size <= spill_threshold:
+        data = stream.read()
+        return data, None, content_digest(data)
+
+    digest = hashlib.sha256()
+    suffix = os.path.splitext(secure_filename(file.filename))[1]
+    fd, spill_path = tempfile.mkstemp(suffix=suffix, dir=upload_folder)
+    with os.fdopen(fd, 'wb') as spill_file:
+        for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            spill_file.write(chunk)
+    return spill_path, spill_path, digest.hexdigest()
+
+async def process_resume_file(file, upload_folder, spill_threshold=UPLOAD_SPILL_THRESHOLD, text_cache=None):
     filename = secure_filename(file.filename)
-    file_path = os.path.join(upload_folder, filename)
-    
-    # Save file asynchronously
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, file.save, file_path)
-    
-    # Extract text based on file type
     if filename.endswith('.pdf'):
-        resume_text = await extract_text_from_pdf(file_path)
+        extract = extract_pdf
     elif filename.endswith(('.docx', '.doc')):
-        resume_text = await extract_text_from_docx(file_path)
+        extract = extract_docx
     else:
-        return None, None
+        return None
     
-    return resume_text, file_path
+    loop = asyncio.get_running_loop()
+    with stage_timer('upload_ingest'):
+        source, spill_path, digest = await loop.run_in_executor(None, _ingest_upload, file, upload_folder, spill_threshold)
+    try:
+        # Re-uploads of the same file skip parsing entirely
+        if text_cache is not None:
+            cached = await loop.run_in_executor(None, text_cache.get, digest)
+            if cached is not None:
+                return cached['text']
+
+        with stage_timer('parse'):
+            result = await extract(source)
+        resume_text = normalize_extracted_text(result.text)
+        if text_cache is not None and resume_text:
+            await loop.run_in_executor(None, text_cache.set, digest, resume_text, result.elapsed)
+        return resume_text
+    finally:
+        if spill_path:
+            os.remove(spill_path)
+
+# LLM construction
+DEFAULT_MODEL_NAME = "gpt-4o-mini"
+DEFAULT_TEMPERATURE = 0.2
+
+def create_llm(api_key, model_name=DEFAULT_MODEL_NAME, temperature=DEFAULT_TEMPERATURE, http_client=None, http_async_client=None, base_url=None):
+    # base_url is only passed when set, so OPENAI_API_BASE still applies otherwise
+    return ChatOpenAI(
+        model_name=model_name,
+        temperature=temperature,
+        openai_api_key=api_key,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        stream_usage=True,
+        **({'base_url': base_url} if base_url else {})
+    )
 
 # Chain creation functions
-def create_ats_analysis_chain(api_key):
+def create_ats_analysis_chain(api_key, llm=None):
     ats_template = """
     You are an expert ATS (Applicant Tracking System) analyzer and resume optimization specialist.
 
@@ -102,6 +151,9 @@ def create_ats_analysis_chain(api_key):
     JOB DESCRIPTION:
     {job_description}
 
+    LOCAL KEYWORD ANALYSIS (deterministic pre-computation; use it as the baseline for the keyword match, keyword frequency and proximity scores and for the missing keywords list):
+    {keyword_metrics}
+
    Analyze the following resume against the provided job description and generate a detailed ATS compatibility report including:
 
     1. Keyword Match %:
@@ -156,22 +208,18 @@ def create_ats_analysis_chain(api_key):
     {format_instructions}
     """
     
-    llm = ChatOpenAI(
-        model_name="gpt-4o-mini",
-        temperature=0.2,
-        openai_api_key=api_key
-    )
+    llm = llm or create_llm(api_key)
     
     parser = PydanticOutputParser(pydantic_object=ATSScore)
     prompt = PromptTemplate(
         template=ats_template,
-        input_variables=["resume_text", "job_description"],
+        input_variables=["resume_text", "job_description", "keyword_metrics"],
         partial_variables={"format_instructions": parser.get_format_instructions()}
     )
 
     return RunnableSequence(prompt, llm, parser)
 
-def create_resume_optimization_chain(api_key):
+def create_resume_optimization_chain(api_key, llm=None):
     resume_template = """
     You are an expert resume writer, career coach, and Applicant Tracking System (ATS) specialist. Your mission is to transform the candidate’s existing resume into a highly optimized, keyword‑rich document that perfectly aligns with the given job description—while **preserving every original section** of the resume.
 
@@ -241,11 +289,7 @@ def create_resume_optimization_chain(api_key):
     A complete ATS‑optimized resume—retaining and enhancing all original sections.
     """
     
-    llm = ChatOpenAI(
-        model_name="gpt-4o-mini",
-        temperature=0.2,
-        openai_api_key=api_key
-    )
+    llm = llm or create_llm(api_key)
     
     parser = PydanticOutputParser(pydantic_object=ResumeOptimization)
     prompt = PromptTemplate(
@@ -256,8 +300,56 @@ def create_resume_optimization_chain(api_key):
 
     return RunnableSequence(prompt, llm, parser)
 
-def create_cover_letter_chain(api_key):
-    current_date = datetime.now().strftime("%B %d, %Y")
+def create_analyze_and_optimize_chain(api_key, llm=None):
+    # Single pass: the resume and job description are sent once and both
+    # structures come back from one structured-output call
+    combined_template = """
+    You are an expert ATS (Applicant Tracking System) analyzer and resume writer. First score the resume against the job description, then rewrite it to fix what the analysis found.
+
+    RESUME TEXT:
+    {resume_text}
+
+    JOB DESCRIPTION:
+    {job_description}
+
+    LOCAL KEYWORD ANALYSIS (deterministic pre-computation; use it as the baseline for the keyword match, keyword frequency and proximity scores and for the missing keywords list):
+    {keyword_metrics}
+
+    PART 1 - ats_analysis:
+    1. Keyword Match %: exact and semantic matches of skills, tools, certifications and job titles, weighted by placement (summary, skills, experience)
+    2. Section Completion %: presence and order of the core ATS sections
+    3. Formatting and Readability Score: standard headings, consistent dates, no tables/columns/graphics
+    4. Hard vs Soft Skills Balance against the job description
+    5. Proximity Score: related keywords appearing together and in context
+    6. Final ATS Score: (Keyword Match * 0.35) + (Section Completion * 0.25) + (Formatting * 0.20) + (Skills Balance * 0.10) + (Proximity * 0.10)
+    7. Missing keywords, plus 2-3 actionable suggestions per category (searchability, skills, formatting, sections, synonyms), each with its `<category>_issues_count` exactly equal to the number of issues found
+
+    PART 2 - optimization:
+    1. Retain every original section, position, date and credential; never invent experience
+    2. Professional summary of 1-3 sentences with the top job description keywords
+    3. Rewrite every experience bullet with a strong action verb, embedded job description keywords and quantified impact where the original allows; key improved_bullets by role
+    4. Skills section listing every core job description skill the candidate holds, ordered by relevance
+    5. Work in the missing keywords from PART 1 wherever they are truthful
+    6. improved_resume_text is the complete rewritten resume in a single-column, ATS-friendly layout with standard headings
+
+    {format_instructions}
+    """
+    
+    llm = llm or create_llm(api_key)
+    
+    parser = PydanticOutputParser(pydantic_object=ATSAnalysisAndOptimization)
+    prompt = PromptTemplate(
+        template=combined_template,
+        input_variables=["resume_text", "job_description", "keyword_metrics"],
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    
+    return RunnableSequence(prompt, llm, parser)
+
+def _current_date():
+    return datetime.now().strftime("%B %d, %Y")
+
+def create_cover_letter_chain(api_key, llm=None):
     cover_letter_template = """
     You are an expert cover letter writer with deep knowledge of professional communication and hiring practices.
     
@@ -284,11 +376,7 @@ def create_cover_letter_chain(api_key):
     {format_instructions}
     """
     
-    llm = ChatOpenAI(
-        model_name="gpt-4o-mini",
-        temperature=0.2,
-        openai_api_key=api_key
-    )
+    llm = llm or create_llm(api_key)
     
     parser = PydanticOutputParser(pydantic_object=CoverLetterOutput)
     prompt = PromptTemplate(
@@ -296,48 +384,315 @@ def create_cover_letter_chain(api_key):
         input_variables=["resume_text", "job_description"],
         partial_variables={
             "format_instructions": parser.get_format_instructions(),
-            "current_date": current_date
+            # Resolved on every render so long-lived chains don't freeze the date
+            "current_date": _current_date
         }
     )
     
     return RunnableSequence(prompt, llm, parser)
 
+def create_section_rewrite_chain(api_key, llm=None):
+    # Deliberately small prompt: one section plus the job description, no full resume
+    section_template = """
+    You are an expert resume writer and ATS specialist. Rewrite one section of an already optimized resume so it matches the job description more closely.
+    
+    SECTION: {section_name}
+    
+    CURRENT CONTENT:
+    {current_content}
+    
+    JOB DESCRIPTION:
+    {job_description}
+    
+    KEYWORDS TO WORK IN WHERE TRUTHFUL: {missing_keywords}
+    
+    ADDITIONAL INSTRUCTIONS: {instructions}
+    
+    Rules:
+    1. Keep every fact, employer, title, date and metric; never invent experience
+    2. A summary is 1-3 sentences using the most important job description keywords
+    3. An experience block is returned as one bullet per line, without bullet characters, starting with a strong action verb and quantified where the original allows
+    4. Return only the rewritten section content
+    
+    {format_instructions}
+    """
+    
+    llm = llm or create_llm(api_key)
+    
+    parser = PydanticOutputParser(pydantic_object=SectionRewrite)
+    prompt = PromptTemplate(
+        template=section_template,
+        input_variables=["section_name", "current_content", "job_description", "missing_keywords", "instructions"],
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    
+    return RunnableSequence(prompt, llm, parser)
 
-# Document creation functions
+def create_streaming_chain(chain):
+    # Same prompt and model, but emits partial JSON dicts as tokens arrive.
+    # The caller validates the final dict against the chain's Pydantic model.
+    return RunnableSequence(chain.first, *chain.middle, JsonOutputParser())
+
+# Chain registry: chains are built once per process and share one pooled HTTP client
+CHAIN_FACTORIES = {
+    'ats_analysis': create_ats_analysis_chain,
+    'resume_optimization': create_resume_optimization_chain,
+    'cover_letter': create_cover_letter_chain,
+    'section_rewrite': create_section_rewrite_chain,
+    'analyze_and_optimize': create_analyze_and_optimize_chain
+}
+
+# Model calls in flight per process (LLM_CONCURRENCY) and the per-call timeout
+# in seconds (LLM_TIMEOUT); both apply on the registry's background event loop
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "256"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "90"))
+
+class LLMTimeoutError(Exception):
+    pass
+
+def create_http_client(max_connections=None, max_keepalive_connections=None, keepalive_expiry=None):
+    limits = httpx.Limits(
+        max_connections=max_connections or int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=max_keepalive_connections or int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=keepalive_expiry or float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
+    )
+    return httpx.Client(limits=limits, timeout=httpx.Timeout(60.0, connect=10.0))
+
+def create_async_http_client():
+    # Sized for the concurrency limit: async calls hold a connection, not a thread
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", str(LLM_CONCURRENCY))),
+        max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30"))
+    )
+    return httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(60.0, connect=10.0))
+
+# Async LLM calls run on one long-lived loop: Flask gives every async view a fresh
+# event loop, and pooled async connections cannot be shared across loops
+class BackgroundEventLoop:
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name='llm-event-loop', daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def run(self, coro):
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def iterate(self, async_iterable):
+        # Drive an async iterator on the loop and hand its items to a synchronous consumer
+        items = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for item in async_iterable:
+                    items.put((item, None))
+            except Exception as e:
+                items.put((None, e))
+            finally:
+                items.put((done, None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item, error = items.get()
+                if error is not None:
+                    raise error
+                if item is done:
+                    break
+                yield item
+        finally:
+            # Consumer went away or we finished; stop the upstream work either way
+            future.cancel()
+
+    def stop(self):
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop = None
+                self._thread = None
+
+class ChainRegistry:
+    def __init__(self, api_key=None, model_name=None, temperature=None, http_client=None, llm_factory=None):
+        self._lock = threading.Lock()
+        # Swappable so benchmarks can substitute a local model for ChatOpenAI
+        self.llm_factory = llm_factory or create_llm
+        self._chains = {}
+        self._config = self._make_config(api_key, model_name, temperature)
+        self._http_client = http_client
+        self._http_async_client = None
+        self.event_loop = BackgroundEventLoop()
+        self.reload_count = 0
+        self.llm_metrics = LLMMetricsCallback()
+        self.concurrency = LLM_CONCURRENCY
+        self.call_timeout = LLM_TIMEOUT
+        self._semaphore = None
+        self._call_stats = {'calls': 0, 'waiting': 0, 'in_flight': 0, 'timeouts': 0, 'errors': 0}
+        # Backend routing state (breakers, latency history) outlives chain rebuilds
+        self.router = LLMRouter()
+
+    @staticmethod
+    def _make_config(api_key, model_name, temperature):
+        return (
+            api_key,
+            model_name or os.getenv("OPENAI_MODEL", DEFAULT_MODEL_NAME),
+            float(temperature if temperature is not None else os.getenv("OPENAI_TEMPERATURE", DEFAULT_TEMPERATURE))
+        )
+
+    @property
+    def http_client(self):
+        # The pool is independent of the API key, so it survives reloads
+        if self._http_client is None:
+            self._http_client = create_http_client()
+        return self._http_client
+
+    @property
+    def http_async_client(self):
+        # Only ever used from the registry's background event loop
+        if self._http_async_client is None:
+            self._http_async_client = create_async_http_client()
+        return self._http_async_client
+
+    def _build(self):
+        # Every chain shares one routed model over the configured backends (LLM_BACKENDS)
+        api_key, model_name, temperature = self._config
+        backends = []
+        for config in backend_configs(api_key, model_name):
+            options = {'base_url': config['base_url']} if config['base_url'] else {}
+            backends.append((config['name'], self.llm_factory(
+                config['api_key'],
+                model_name=config['model_name'],
+                temperature=temperature,
+                http_client=self.http_client,
+                http_async_client=self.http_async_client,
+                **options
+            )))
+        llm = RoutedChatModel(backends=backends, router=self.router)
+        chains = {name: factory(api_key, llm=llm) for name, factory in CHAIN_FACTORIES.items()}
+        for name in CHAIN_FACTORIES:
+            chains[f"{name}_stream"] = create_streaming_chain(chains[name])
+        return chains
+
+    def get(self, name):
+        chains = self._chains
+        if not chains:
+            with self._lock:
+                if not self._chains:
+                    self._chains = self._build()
+                chains = self._chains
+        return chains[name]
+
+    def configure(self, api_key, model_name=None, temperature=None):
+        # Hot reload: rebuild only when the key or model config actually changed
+        config = self._make_config(api_key, model_name, temperature)
+        with self._lock:
+            if config == self._config and self._chains:
+                return False
+            self._config = config
+            if self._chains:
+                self._chains = self._build()
+                self.reload_count += 1
+        return True
+
+    def run_config(self, name):
+        # Labels model latency/token metrics with the chain that made the call
+        return {'callbacks': [self.llm_metrics], 'metadata': {'chain_name': name}, 'run_name': name}
+
+    @asynccontextmanager
+    async def _call_slot(self, name):
+        # Runs on the background loop, so one semaphore bounds every route's model calls
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        stats = self._call_stats
+        stats['waiting'] += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            stats['waiting'] -= 1
+        stats['calls'] += 1
+        stats['in_flight'] += 1
+        try:
+            yield
+        except asyncio.TimeoutError:
+            stats['timeouts'] += 1
+            raise LLMTimeoutError(f"{name} did not respond within {self.call_timeout} seconds")
+        except Exception:
+            stats['errors'] += 1
+            raise
+        finally:
+            stats['in_flight'] -= 1
+            self._semaphore.release()
+
+    async def _ainvoke(self, name, inputs):
+        async with self._call_slot(name):
+            return await asyncio.wait_for(self.get(name).ainvoke(inputs, self.run_config(name)), self.call_timeout)
+
+    async def _astream(self, name, inputs):
+        # The timeout applies to the whole stream, not to each chunk: every chunk
+        # is awaited with whatever is left of one deadline
+        loop = asyncio.get_running_loop()
+        async with self._call_slot(name):
+            deadline = loop.time() + self.call_timeout
+            partials = self.get(f"{name}_stream").astream(inputs, self.run_config(name))
+            try:
+                while True:
+                    try:
+                        partial = await asyncio.wait_for(partials.__anext__(), max(0.0, deadline - loop.time()))
+                    except StopAsyncIteration:
+                        return
+                    yield partial
+            finally:
+                await partials.aclose()
+
+    async def ainvoke(self, name, inputs):
+        # Await a chain's native ainvoke on the shared event loop from any request loop
+        return await self.event_loop.run(self._ainvoke(name, inputs))
+
+    def stream(self, name, inputs):
+        # Synchronous iterator over partial outputs, suitable for a streamed Flask response
+        return self.event_loop.iterate(self._astream(name, inputs))
+
+    def call_stats(self):
+        return {
+            **self._call_stats,
+            'concurrency': self.concurrency,
+            'timeout': self.call_timeout,
+            'routing': self.router.stats()
+        }
+
+    def output_model(self, name):
+        return self.get(name).last.pydantic_object
+
+    def close(self):
+        with self._lock:
+            self._chains = {}
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            if self._http_async_client is not None and self.event_loop._loop is not None:
+                self.event_loop.submit(self._http_async_client.aclose()).result(timeout=5)
+            self._http_async_client = None
+        self.event_loop.stop()
+
+
+# Document creation functions (rendering runs in the document_rendering process pool)
 async def create_docx_document(content, document_type="resume"):
-    return await _sync_create_docx_document(content, document_type)
-
-async def _sync_create_docx_document(content, document_type):
-    doc = DocxDocument()
-    sections = content.split('\n\n')
-    for section in sections:
-        if section.strip():
-            doc.add_paragraph(section)
-    file_obj = BytesIO()
-    doc.save(file_obj)
-    file_obj.seek(0)
-    return file_obj
+    return BytesIO(await render_document(content, document_type, 'docx'))
 
 async def create_pdf_document(content, document_type="resume"):
-    return await _sync_create_pdf_document(content, document_type)
-
-async def _sync_create_pdf_document(content, document_type):
-    file_obj = BytesIO()
-    doc = SimpleDocTemplate(file_obj, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-    normal_style = styles['Normal']
-    heading_style = styles['Heading1']
-    
-    sections = content.split('\n\n')
-    for section in sections:
-        if section.strip():
-            if len(section) < 50 and section.isupper() or ':' in section and len(section.split(':')[0]) < 20:
-                story.append(Paragraph(section, heading_style))
-            else:
-                story.append(Paragraph(section, normal_style))
-            story.append(Spacer(1, 12))
-    
-    doc.build(story)
-    file_obj.seek(0)
-    return file_obj
+    return BytesIO(await render_document(content, document_type, 'pdf'))
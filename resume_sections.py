@@ -0,0 +1,250 @@
+import re
+from functools import lru_cache
+
+BULLET_PREFIX = re.compile(r"^\s*(?:[-•*●–]\s*)?")
+BULLET_LINE = re.compile(r"^\s*[-•*●▪–>]\s*\S")
+
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'about me', 'career objective'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment history', 'work history'),
+    'education': ('education', 'academic background', 'education and training'),
+    'skills': ('skills', 'technical skills', 'core competencies', 'key skills', 'competencies'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'licenses and certifications'),
+    'projects': ('projects', 'key projects', 'personal projects')
+}
+
+_HEADING_LOOKUP = {
+    alias: name for name, aliases in SECTION_HEADINGS.items() for alias in aliases
+}
+
+MAX_HEADING_LENGTH = 40
+SKILL_SEPARATORS = re.compile(r"[,;|•·\n]+")
+
+def strip_bullet(line):
+    return BULLET_PREFIX.sub('', line, count=1).strip()
+
+def split_bullets(text):
+    return [strip_bullet(line) for line in (text or '').splitlines() if strip_bullet(line)]
+
+# Compact document model: every node is a pair of character offsets into the
+# original text, so consumers slice the buffer instead of copying it
+class Span:
+    __slots__ = ('source', 'start', 'end')
+
+    def __init__(self, source, start, end):
+        self.source = source
+        self.start = start
+        self.end = end
+
+    @property
+    def text(self):
+        return self.source[self.start:self.end]
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.start}, {self.end})"
+
+class Role(Span):
+    # One experience entry: title/company/date lines followed by bullets
+    __slots__ = ('header', 'bullets')
+
+    def __init__(self, source, start, end, header, bullets):
+        super().__init__(source, start, end)
+        self.header = header
+        self.bullets = bullets
+
+    @property
+    def title(self):
+        return self.header.text.strip() if self.header else ''
+
+class Section(Span):
+    # kind is a SECTION_HEADINGS key, 'header' for the text before the first
+    # heading, or 'other' for unrecognised all-caps headings
+    __slots__ = ('kind', 'heading', 'body', '_roles')
+
+    def __init__(self, source, kind, heading, body):
+        super().__init__(source, heading.start if heading else body.start, body.end)
+        self.kind = kind
+        self.heading = heading
+        self.body = body
+        self._roles = None
+
+    @property
+    def title(self):
+        return self.heading.text.strip().strip(':').strip() if self.heading else ''
+
+    @property
+    def roles(self):
+        if self._roles is None:
+            self._roles = _split_roles(self.source, self.body.start, self.body.end) if self.kind == 'experience' else []
+        return self._roles
+
+    def items(self):
+        # Comma, pipe or bullet separated entries, e.g. the skills list
+        return [strip_bullet(item) for item in SKILL_SEPARATORS.split(self.body.text) if strip_bullet(item)]
+
+class ResumeDocument:
+    __slots__ = ('text', 'sections')
+
+    def __init__(self, text, sections):
+        self.text = text
+        self.sections = sections
+
+    def section(self, kind):
+        for section in self.sections:
+            if section.kind == kind:
+                return section
+        return None
+
+    def kinds(self):
+        return {section.kind for section in self.sections if section.kind in SECTION_HEADINGS}
+
+    def headings(self):
+        return [section.heading for section in self.sections if section.heading is not None]
+
+    def roles(self):
+        return [role for section in self.sections for role in section.roles]
+
+OTHER_HEADING = re.compile(r"^[A-Z][A-Z &/]{3,}:?$")
+
+def _heading_kind(line, after_blank):
+    stripped = line.strip()
+    if not stripped or len(stripped) >= MAX_HEADING_LENGTH:
+        return None
+    kind = _HEADING_LOOKUP.get(stripped.strip(':').strip().lower())
+    if kind:
+        return kind
+    # Unknown all-caps headings (AWARDS, VOLUNTEER WORK) only count after a blank
+    # line, so an upper-case skill such as AWS inside a list stays body text
+    if after_blank and OTHER_HEADING.match(stripped) and len(stripped.split()) <= 4:
+        return 'other'
+    return None
+
+def _trimmed(source, start, end):
+    # Span without the surrounding blank lines / whitespace
+    while start < end and source[start].isspace():
+        start += 1
+    while end > start and source[end - 1].isspace():
+        end -= 1
+    return Span(source, start, end)
+
+def _split_roles(source, start, end):
+    roles = []
+    header = bullets = None
+    role_start = role_end = start
+    offset = start
+    for line in source[start:end].splitlines(keepends=True):
+        line_start, offset = offset, offset + len(line)
+        line_end = line_start + len(line.rstrip())
+        if not line.strip():
+            continue
+        if BULLET_LINE.match(line):
+            if bullets is None:
+                header, bullets, role_start = None, [], line_start
+            bullets.append(Span(source, line_start, line_end))
+        elif bullets is None or not bullets:
+            # Title, company and date lines before the first bullet share one header
+            if bullets is None:
+                header, bullets, role_start = Span(source, line_start, line_end), [], line_start
+            else:
+                header = Span(source, header.start if header else line_start, line_end)
+        else:
+            roles.append(Role(source, role_start, role_end, header, bullets))
+            header, bullets, role_start = Span(source, line_start, line_end), [], line_start
+        role_end = line_end
+    if bullets is not None:
+        roles.append(Role(source, role_start, role_end, header, bullets))
+    return roles
+
+@lru_cache(maxsize=256)
+def parse_resume(text):
+    # One pass over the lines; roles and skill items are split lazily on access
+    text = text or ''
+    sections = []
+    kind, heading, body_start = 'header', None, 0
+    offset = 0
+    after_blank = True
+    for line in text.splitlines(keepends=True):
+        line_start, offset = offset, offset + len(line)
+        line_kind = _heading_kind(line, after_blank)
+        after_blank = not line.strip()
+        if line_kind == 'other' and heading is None and not text[body_start:line_start].strip():
+            # An all-caps first line is the candidate's name, not a heading
+            line_kind = None
+        if line_kind is None:
+            continue
+        if heading is not None or text[body_start:line_start].strip():
+            sections.append(Section(text, kind, heading, _trimmed(text, body_start, line_start)))
+        stripped_start = line_start + len(line) - len(line.lstrip())
+        kind, heading, body_start = line_kind, Span(text, stripped_start, line_start + len(line.rstrip())), offset
+    if heading is not None or text[body_start:].strip():
+        sections.append(Section(text, kind, heading, _trimmed(text, body_start, len(text))))
+    return ResumeDocument(text, sections)
+
+# Splicing regenerated sections back into improved_resume_text. Each helper
+# returns (text, spliced); text is unchanged when the old content cannot be found.
+def splice_summary(text, old_summary, new_summary):
+    old_summary = (old_summary or '').strip()
+    if old_summary and old_summary in text:
+        return text.replace(old_summary, new_summary.strip(), 1), True
+
+    # Fall back to the body of the parsed summary section
+    summary = parse_resume(text).section('summary')
+    if summary is None or not len(summary.body):
+        return text, False
+    return text[:summary.body.start] + new_summary.strip() + text[summary.body.end:], True
+
+def _bullet_lines(role):
+    # Marked bullets, or every line after the first header line when the role
+    # has no bullet markers at all
+    if role.bullets:
+        return role.bullets
+    lines = []
+    offset = role.start
+    for index, line in enumerate(role.source[role.start:role.end].splitlines(keepends=True)):
+        line_start, offset = offset, offset + len(line)
+        if index and line.strip():
+            lines.append(Span(role.source, line_start, line_start + len(line.rstrip())))
+    return lines
+
+def _find_role(text, role_key, needles):
+    # The role whose header names role_key; when the header does not identify a
+    # single role, the one role holding the old bullets
+    roles = parse_resume(text).roles()
+    key = ' '.join(role_key.lower().split())
+    named = [role for role in roles if key and key in ' '.join(role.title.lower().split())]
+    if len(named) == 1:
+        return named[0]
+    holding = [
+        role for role in (named or roles)
+        if any(needle in line.text for line in _bullet_lines(role) for needle in needles)
+    ]
+    return holding[0] if len(holding) == 1 else None
+
+def splice_bullets(text, role_key, old_bullets, new_bullets):
+    # Only the target role's bullet lines are searched, and the matched bullets
+    # must be consecutive within it, so no other role's lines can be replaced
+    needles = [strip_bullet(bullet) for bullet in old_bullets if strip_bullet(bullet)]
+    role = _find_role(text, role_key, needles)
+    if role is None:
+        return text, False
+    lines = _bullet_lines(role)
+    positions = []
+    for needle in needles:
+        for index, line in enumerate(lines):
+            if index not in positions and needle in line.text:
+                positions.append(index)
+                break
+    positions.sort()
+    if not positions or positions[-1] - positions[0] + 1 != len(positions):
+        return text, False
+
+    first, last = lines[positions[0]], lines[positions[-1]]
+    # Reuse the original bullet marker and spacing between bullets
+    prefix = BULLET_PREFIX.match(first.text).group(0)
+    blank_separated = any(text[lines[index].end:lines[index + 1].start].count('\n') > 1 for index in positions[:-1])
+    separator = '\n\n' if blank_separated else '\n'
+    replacement = separator.join(prefix + strip_bullet(bullet) for bullet in new_bullets)
+    return text[:first.start] + replacement + text[last.end:], True
@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+DEFAULT_SESSION_TTL = 24 * 60 * 60
+
+# Session data is kept per (session_id, namespace) as individually encoded fields,
+# so readers can fetch e.g. only the improved resume text without the whole record.
+class SessionStore:
+    def set_fields(self, session_id, namespace, fields):
+        raise NotImplementedError
+
+    def get_fields(self, session_id, namespace, fields=None):
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def get_field(self, session_id, namespace, field, default=None):
+        values = self.get_fields(session_id, namespace, [field])
+        if values is None or field not in values:
+            return default
+        return values[field]
+
+    def exists(self, session_id, namespace):
+        return self.get_fields(session_id, namespace, []) is not None
+
+class MemorySessionStore(SessionStore):
+    def __init__(self, ttl=DEFAULT_SESSION_TTL):
+        self.ttl = ttl
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def _live_record(self, session_id, namespace):
+        record = self._records.get((session_id, namespace))
+        if record is None:
+            return None
+        if self.ttl and record['updated_at'] + self.ttl < time.time():
+            del self._records[(session_id, namespace)]
+            return None
+        return record
+
+    def set_fields(self, session_id, namespace, fields):
+        encoded = {name: json.dumps(value) for name, value in fields.items()}
+        with self._lock:
+            record = self._live_record(session_id, namespace)
+            if record is None:
+                record = self._records[(session_id, namespace)] = {'fields': {}, 'updated_at': 0}
+            record['fields'].update(encoded)
+            record['updated_at'] = time.time()
+
+    def get_fields(self, session_id, namespace, fields=None):
+        with self._lock:
+            record = self._live_record(session_id, namespace)
+            if record is None:
+                return None
+            stored = record['fields']
+            names = stored.keys() if fields is None else [name for name in fields if name in stored]
+            encoded = {name: stored[name] for name in names}
+        return {name: json.loads(value) for name, value in encoded.items()}
+
+    def delete(self, session_id):
+        with self._lock:
+            for key in [key for key in self._records if key[0] == session_id]:
+                del self._records[key]
+
+class SQLiteSessionStore(SessionStore):
+    def __init__(self, path, ttl=DEFAULT_SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_fields ("
+                "session_id TEXT NOT NULL, namespace TEXT NOT NULL, field TEXT NOT NULL, "
+                "value TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (session_id, namespace, field))"
+            )
+
+    def _connection(self):
+        # One connection per thread; WAL lets readers in other workers proceed during writes
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def set_fields(self, session_id, namespace, fields):
+        now = time.time()
+        rows = [(session_id, namespace, name, json.dumps(value), now) for name, value in fields.items()]
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO session_fields (session_id, namespace, field, value, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            # Touch the remaining fields so the whole record shares one expiry
+            conn.execute(
+                "UPDATE session_fields SET updated_at = ? WHERE session_id = ? AND namespace = ?",
+                (now, session_id, namespace)
+            )
+
+    def get_fields(self, session_id, namespace, fields=None):
+        conn = self._connection()
+        min_updated = time.time() - self.ttl if self.ttl else 0
+        if fields is None:
+            rows = conn.execute(
+                "SELECT field, value FROM session_fields "
+                "WHERE session_id = ? AND namespace = ? AND updated_at >= ?",
+                (session_id, namespace, min_updated)
+            ).fetchall()
+            if not rows:
+                return None
+        else:
+            exists = conn.execute(
+                "SELECT 1 FROM session_fields WHERE session_id = ? AND namespace = ? AND updated_at >= ? LIMIT 1",
+                (session_id, namespace, min_updated)
+            ).fetchone()
+            if exists is None:
+                return None
+            if not fields:
+                return {}
+            placeholders = ', '.join('?' for _ in fields)
+            rows = conn.execute(
+                f"SELECT field, value FROM session_fields "
+                f"WHERE session_id = ? AND namespace = ? AND field IN ({placeholders})",
+                (session_id, namespace, *fields)
+            ).fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    def delete(self, session_id):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM session_fields WHERE session_id = ?", (session_id,))
+
+    def purge_expired(self):
+        if not self.ttl:
+            return 0
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM session_fields WHERE updated_at < ?", (time.time() - self.ttl,)
+            )
+        return cursor.rowcount
+
+class RedisSessionStore(SessionStore):
+    # Works with Redis and protocol-compatible servers (KeyDB, Dragonfly, Valkey)
+    def __init__(self, url, ttl=DEFAULT_SESSION_TTL, prefix='session'):
+        if redis is None:
+            raise RuntimeError("The redis package is required for redis:// session stores")
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, session_id, namespace):
+        return f"{self.prefix}:{session_id}:{namespace}"
+
+    def set_fields(self, session_id, namespace, fields):
+        key = self._key(session_id, namespace)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(key, mapping={name: json.dumps(value) for name, value in fields.items()})
+        if self.ttl:
+            pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def get_fields(self, session_id, namespace, fields=None):
+        key = self._key(session_id, namespace)
+        if fields is None:
+            stored = self.client.hgetall(key)
+            if not stored:
+                return None
+            return {name.decode('utf-8'): json.loads(value) for name, value in stored.items()}
+
+        if not fields:
+            return {} if self.client.exists(key) else None
+        values = self.client.hmget(key, fields)
+        if all(value is None for value in values) and not self.client.exists(key):
+            return None
+        return {name: json.loads(value) for name, value in zip(fields, values) if value is not None}
+
+    def delete(self, session_id):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:{session_id}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+def create_session_store(url=None, ttl=None):
+    url = url or os.getenv("SESSION_STORE_URL", "memory://")
+    ttl = ttl if ttl is not None else int(os.getenv("SESSION_TTL", str(DEFAULT_SESSION_TTL)))
+    parsed = urlparse(url)
+
+    if parsed.scheme == 'memory':
+        return MemorySessionStore(ttl=ttl)
+    if parsed.scheme == 'sqlite':
+        # sqlite:///relative.db or sqlite:////absolute/path.db
+        path = url[len('sqlite:///'):]
+        return SQLiteSessionStore(path, ttl=ttl)
+    if parsed.scheme in ('redis', 'rediss', 'unix'):
+        return RedisSessionStore(url, ttl=ttl)
+    raise ValueError(f"Unsupported session store URL: {url}")
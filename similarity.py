@@ -0,0 +1,239 @@
+import os
+import json
+import zlib
+import importlib
+import threading
+
+import numpy as np
+
+from ats_scorer import tokenize, normalize_token, STOPWORDS
+from batch_scoring import fingerprint
+
+# Resume <-> job description similarity over a persisted vector matrix
+# (SIMILARITY_INDEX_DIR, SIMILARITY_DIMENSIONS, SIMILARITY_ENCODER)
+DEFAULT_DIMENSIONS = int(os.getenv("SIMILARITY_DIMENSIONS", "4096"))
+INITIAL_CAPACITY = 256
+NORM_CHUNK_ROWS = 4096
+
+# Encoders turn texts into an (n, dimensions) float32 matrix. uses_idf encoders
+# return raw term frequencies and the index applies corpus IDF at query time;
+# embedding encoders return unit vectors and are compared as-is.
+class HashedNgramEncoder:
+    uses_idf = True
+
+    def __init__(self, dimensions=DEFAULT_DIMENSIONS, max_ngram=2):
+        self.dimensions = dimensions
+        self.max_ngram = max_ngram
+        self.name = f"hashed-ngram-{max_ngram}-{dimensions}"
+
+    def _buckets(self, text):
+        lemmas = [normalize_token(token) for token in tokenize(text) if token not in STOPWORDS]
+        grams = [
+            ' '.join(lemmas[index:index + n])
+            for n in range(1, self.max_ngram + 1)
+            for index in range(len(lemmas) - n + 1)
+        ]
+        # crc32 is stable across processes, unlike hash()
+        return np.fromiter((zlib.crc32(gram.encode('utf-8')) % self.dimensions for gram in grams), dtype=np.int64, count=len(grams))
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = np.bincount(self._buckets(text), minlength=self.dimensions)
+            # Sublinear term frequency, so one repeated keyword cannot dominate
+            vectors[row] = np.log1p(counts)
+        return vectors
+
+class EmbeddingEncoder:
+    # Wraps any callable mapping a list of texts to vectors (e.g. a local
+    # sentence-transformers model's encode)
+    uses_idf = False
+
+    def __init__(self, embed, dimensions, name='embedding'):
+        self.embed = embed
+        self.dimensions = dimensions
+        self.name = name
+
+    def encode(self, texts):
+        vectors = np.asarray(self.embed(list(texts)), dtype=np.float32).reshape(len(texts), self.dimensions)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+def load_encoder(spec=None, dimensions=None):
+    # "hashed" (default) or "package.module:factory", where factory(dimensions) returns an encoder
+    spec = spec or os.getenv("SIMILARITY_ENCODER", "hashed")
+    dimensions = dimensions or DEFAULT_DIMENSIONS
+    if spec == 'hashed':
+        return HashedNgramEncoder(dimensions)
+    module_name, _, attribute = spec.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)(dimensions)
+
+# Index
+class SimilarityIndex:
+    def __init__(self, encoder=None, directory=None):
+        self.encoder = encoder or load_encoder()
+        self.dimensions = self.encoder.dimensions
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._ids = []
+        self._names = []
+        self._positions = {}
+        self._df = np.zeros(self.dimensions, dtype=np.float64)
+        self._norms = None
+        self._counters = {'queries': 0, 'encoded': 0, 'reused': 0}
+        self._vectors = np.zeros((INITIAL_CAPACITY, self.dimensions), dtype=np.float32)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._open()
+
+    # Persistence: vectors live in a raw float32 file that is memory-mapped and
+    # grown by doubling; ids, names and document frequencies sit next to it
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _open(self):
+        meta_path = self._path('meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['encoder'] != self.encoder.name:
+                raise ValueError(f"Index at {self.directory} was built with {meta['encoder']}, not {self.encoder.name}")
+            self._ids = meta['ids']
+            self._names = meta['names']
+            self._positions = {doc_id: row for row, doc_id in enumerate(self._ids)}
+            self._df = np.load(self._path('df.npy'))
+        capacity = max(INITIAL_CAPACITY, len(self._ids))
+        self._map(capacity)
+
+    def _map(self, capacity):
+        path = self._path('vectors.f32')
+        size = capacity * self.dimensions * 4
+        with open(path, 'ab') as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._vectors = np.memmap(path, dtype=np.float32, mode='r+', shape=(capacity, self.dimensions))
+
+    def _grow(self, needed):
+        capacity = len(self._vectors)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        if self.directory:
+            self._vectors.flush()
+            self._map(capacity)
+        else:
+            grown = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            grown[:len(self._ids)] = self._vectors[:len(self._ids)]
+            self._vectors = grown
+
+    def _persist(self):
+        if not self.directory:
+            return
+        self._vectors.flush()
+        np.save(self._path('df.npy.tmp.npy'), self._df)
+        os.replace(self._path('df.npy.tmp.npy'), self._path('df.npy'))
+        meta_tmp = self._path('meta.json.tmp')
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump({'encoder': self.encoder.name, 'ids': self._ids, 'names': self._names}, f)
+        os.replace(meta_tmp, self._path('meta.json'))
+
+    def add_many(self, named_texts):
+        # [(name, text)] -> document ids; identical texts are encoded once and
+        # keep their existing row
+        with self._lock:
+            doc_ids = []
+            new = {}
+            for name, text in named_texts:
+                doc_id = fingerprint(text)
+                doc_ids.append(doc_id)
+                if doc_id in self._positions:
+                    self._names[self._positions[doc_id]] = name
+                    self._counters['reused'] += 1
+                elif doc_id not in new:
+                    new[doc_id] = (doc_id, name, text)
+            new = list(new.values())
+            if new:
+                vectors = self.encoder.encode([text for _, _, text in new])
+                start = len(self._ids)
+                self._grow(start + len(new))
+                self._vectors[start:start + len(new)] = vectors
+                for offset, (doc_id, name, _) in enumerate(new):
+                    self._positions[doc_id] = start + offset
+                    self._ids.append(doc_id)
+                    self._names.append(name)
+                if self.encoder.uses_idf:
+                    self._df += (vectors > 0).sum(axis=0)
+                self._norms = None
+                self._counters['encoded'] += len(new)
+                self._persist()
+            return doc_ids
+
+    def _idf(self):
+        if not self.encoder.uses_idf:
+            return np.ones(self.dimensions, dtype=np.float32)
+        count = len(self._ids)
+        return (np.log((1 + count) / (1 + self._df)) + 1).astype(np.float32)
+
+    def _row_norms(self, idf):
+        # IDF-weighted row norms, recomputed only after the corpus changes
+        if self._norms is None:
+            count = len(self._ids)
+            weights = idf ** 2
+            norms = np.empty(count, dtype=np.float32)
+            for start in range(0, count, NORM_CHUNK_ROWS):
+                chunk = self._vectors[start:min(start + NORM_CHUNK_ROWS, count)]
+                norms[start:start + len(chunk)] = np.sqrt((chunk ** 2) @ weights)
+            self._norms = np.maximum(norms, 1e-12)
+        return self._norms
+
+    def scores(self, query_texts, doc_ids=None):
+        # Cosine similarity of every query against the indexed (or the given)
+        # documents with one matrix multiply: (queries x dims) @ (dims x docs)
+        with self._lock:
+            self._counters['queries'] += len(query_texts)
+            idf = self._idf()
+            norms = self._row_norms(idf)
+            queries = self.encoder.encode(query_texts) * idf
+            queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+            if doc_ids is None:
+                rows = np.arange(len(self._ids))
+                matrix = self._vectors[:len(self._ids)]
+            else:
+                rows = np.array([self._positions[doc_id] for doc_id in doc_ids], dtype=np.int64)
+                matrix = self._vectors[rows]
+            return (queries * idf) @ matrix.T / norms[rows], rows
+
+    def top_k(self, query_texts, k=10, doc_ids=None):
+        # One ranked [(doc_id, name, similarity)] list per query
+        similarities, rows = self.scores(query_texts, doc_ids)
+        k = max(0, min(k, similarities.shape[1]))
+        ranked = []
+        for row_scores in similarities:
+            if k == 0:
+                ranked.append([])
+                continue
+            best = np.argpartition(-row_scores, k - 1)[:k]
+            best = best[np.argsort(-row_scores[best], kind='stable')]
+            ranked.append([
+                (self._ids[rows[column]], self._names[rows[column]], round(float(row_scores[column]), 4))
+                for column in best
+            ])
+        return ranked
+
+    def __len__(self):
+        return len(self._ids)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                'documents': len(self._ids),
+                'capacity': len(self._vectors),
+                'dimensions': self.dimensions,
+                'encoder': self.encoder.name,
+                'persistent': bool(self.directory)
+            }
+
+def create_similarity_index(directory=None):
+    return SimilarityIndex(directory=directory or os.getenv("SIMILARITY_INDEX_DIR") or None)
@@ -0,0 +1,251 @@
+import os
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+# Bundled skills taxonomy (canonical name -> category, aliases) compiled into an
+# Aho–Corasick automaton. The compiled arrays are written once per taxonomy
+# version and memory-mapped by every worker (SKILLS_TAXONOMY, SKILLS_INDEX_DIR).
+TAXONOMY_PATH = os.getenv(
+    "SKILLS_TAXONOMY", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.json')
+)
+INDEX_DIR = os.getenv("SKILLS_INDEX_DIR", os.path.join(tempfile.gettempdir(), 'resume-skills-index'))
+INDEX_VERSION = 1
+INDEX_ARRAYS = ('delta', 'out_offsets', 'out_patterns', 'pattern_skill', 'pattern_length')
+
+# A match must not be glued to a neighbouring word ("java" in "javascript", "c" in
+# "c++"); a dot between word characters joins them ("js" in "node.js")
+WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789+#')
+
+def _joined_before(text, start):
+    if start == 0:
+        return False
+    before = text[start - 1]
+    return before in WORD_CHARS or (before == '.' and start > 1 and text[start - 2] in WORD_CHARS)
+
+def _joined_after(text, end):
+    if end + 1 >= len(text):
+        return False
+    after = text[end + 1]
+    return after in WORD_CHARS or (after == '.' and end + 2 < len(text) and text[end + 2] in WORD_CHARS)
+
+def normalize(text):
+    return ' '.join((text or '').lower().split())
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        taxonomy = json.load(f)['skills']
+    names, categories, patterns = [], [], {}
+    for skill_id, (name, entry) in enumerate(taxonomy.items()):
+        names.append(name)
+        categories.append(entry.get('category', ''))
+        # "patterns" replaces the name for ambiguous skills such as Go or R
+        for pattern in entry.get('patterns') or [name, *entry.get('aliases', [])]:
+            patterns.setdefault(normalize(pattern), skill_id)
+    return names, categories, patterns
+
+def taxonomy_digest(path=TAXONOMY_PATH):
+    digest = hashlib.sha256(f"v{INDEX_VERSION}:".encode('utf-8'))
+    with open(path, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+# Compilation
+def compile_index(path=TAXONOMY_PATH):
+    names, categories, patterns = load_taxonomy(path)
+    pattern_list = list(patterns)
+    alphabet = sorted({char for pattern in pattern_list for char in pattern})
+    symbols = {char: index + 1 for index, char in enumerate(alphabet)}  # 0 = any other character
+    width = len(alphabet) + 1
+
+    goto = [{}]
+    outputs = [[]]
+    for pattern_id, pattern in enumerate(pattern_list):
+        state = 0
+        for char in pattern:
+            symbol = symbols[char]
+            if symbol not in goto[state]:
+                goto.append({})
+                outputs.append([])
+                goto[state][symbol] = len(goto) - 1
+            state = goto[state][symbol]
+        outputs[state].append(pattern_id)
+
+    # Breadth-first failure links, folded into a dense transition table so the
+    # scan is one lookup per character
+    delta = np.zeros((len(goto), width), dtype=np.int32)
+    fail = [0] * len(goto)
+    queue = deque()
+    for symbol, child in goto[0].items():
+        delta[0, symbol] = child
+        queue.append(child)
+    while queue:
+        state = queue.popleft()
+        outputs[state] = outputs[state] + outputs[fail[state]]
+        delta[state] = delta[fail[state]]
+        for symbol, child in goto[state].items():
+            fail[child] = int(delta[fail[state], symbol])
+            delta[state, symbol] = child
+            queue.append(child)
+
+    out_offsets = np.zeros(len(goto) + 1, dtype=np.int32)
+    out_offsets[1:] = np.cumsum([len(found) for found in outputs])
+    arrays = {
+        'delta': delta,
+        'out_offsets': out_offsets,
+        'out_patterns': np.array([pattern_id for found in outputs for pattern_id in found], dtype=np.int32),
+        'pattern_skill': np.array([patterns[pattern] for pattern in pattern_list], dtype=np.int32),
+        'pattern_length': np.array([len(pattern) for pattern in pattern_list], dtype=np.int32)
+    }
+    meta = {
+        'version': INDEX_VERSION,
+        'alphabet': ''.join(alphabet),
+        'skills': names,
+        'categories': categories,
+        'patterns': pattern_list
+    }
+    return arrays, meta
+
+def save_index(arrays, meta, directory):
+    # Written to a scratch directory and renamed into place, so concurrent workers
+    # never see a half-written index
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    scratch = tempfile.mkdtemp(dir=parent)
+    try:
+        for name in INDEX_ARRAYS:
+            np.save(os.path.join(scratch, f"{name}.npy"), arrays[name])
+        with open(os.path.join(scratch, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.rename(scratch, directory)
+    except OSError:
+        # Another worker won the race; its index is identical
+        shutil.rmtree(scratch, ignore_errors=True)
+        if not os.path.exists(os.path.join(directory, 'meta.json')):
+            raise
+
+# Matching
+class SkillIndex:
+    def __init__(self, arrays, meta):
+        self.arrays = arrays
+        self.skills = meta['skills']
+        self.categories = meta['categories']
+        self.patterns = meta['patterns']
+        self.symbols = {char: index + 1 for index, char in enumerate(meta['alphabet'])}
+        self.width = len(meta['alphabet']) + 1
+        # memoryviews index the mapped pages directly, without numpy scalar overhead
+        self._delta = memoryview(arrays['delta'].reshape(-1))
+        self._out_offsets = memoryview(arrays['out_offsets'])
+        self._out_patterns = memoryview(arrays['out_patterns'])
+        self._pattern_skill = memoryview(arrays['pattern_skill'])
+        self._pattern_length = memoryview(arrays['pattern_length'])
+        self._lookup = {pattern: self._pattern_skill[pattern_id] for pattern_id, pattern in enumerate(self.patterns)}
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None)
+            for name in INDEX_ARRAYS
+        }
+        return cls(arrays, meta)
+
+    def scan(self, text):
+        # Single pass over the normalized text; yields (skill_id, matched surface)
+        text = normalize(text)
+        delta, width, symbols = self._delta, self.width, self.symbols
+        out_offsets, out_patterns = self._out_offsets, self._out_patterns
+        state = 0
+        for end, char in enumerate(text):
+            state = delta[state * width + symbols.get(char, 0)]
+            first, stop = out_offsets[state], out_offsets[state + 1]
+            if first == stop or _joined_after(text, end):
+                continue
+            for index in range(first, stop):
+                pattern_id = out_patterns[index]
+                if not _joined_before(text, end - self._pattern_length[pattern_id] + 1):
+                    yield self._pattern_skill[pattern_id], self.patterns[pattern_id]
+
+    def find(self, text):
+        # {canonical skill: sorted surfaces found}, in taxonomy order
+        found = {}
+        for skill_id, surface in self.scan(text):
+            found.setdefault(skill_id, set()).add(surface)
+        return {self.skills[skill_id]: sorted(found[skill_id]) for skill_id in sorted(found)}
+
+    def canonical(self, phrase):
+        skill_id = self._lookup.get(normalize(phrase))
+        return self.skills[skill_id] if skill_id is not None else None
+
+    def category(self, name):
+        return self.categories[self.skills.index(name)]
+
+_index = None
+_index_lock = threading.Lock()
+
+def load_index(path=TAXONOMY_PATH, index_dir=INDEX_DIR):
+    # Compiles on first use per taxonomy version; later workers only map the files
+    directory = os.path.join(index_dir, taxonomy_digest(path)[:16])
+    if not os.path.exists(os.path.join(directory, 'meta.json')):
+        save_index(*compile_index(path), directory)
+    return SkillIndex.load(directory)
+
+def skill_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = load_index()
+    return _index
+
+@lru_cache(maxsize=256)
+def _find_skills(text):
+    return skill_index().find(text)
+
+def find_skills(text):
+    return _find_skills(text or '')
+
+def canonical_skill(phrase):
+    return skill_index().canonical(phrase)
+
+def skill_gap(resume_text, job_description):
+    # Canonical skills the JD asks for, split into matched and missing. aliases
+    # lists skills both mention under different names (JD term, resume term).
+    required = find_skills(job_description)
+    present = find_skills(resume_text)
+    aliases = []
+    for name, surfaces in required.items():
+        if name in present and not set(surfaces) & set(present[name]):
+            aliases.append((surfaces[0], present[name][0], name))
+    return {
+        'required': list(required),
+        'matched': [name for name in required if name in present],
+        'missing': [name for name in required if name not in present],
+        'aliases': aliases
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile the skills taxonomy into a memory-mappable index.')
+    parser.add_argument('--taxonomy', default=TAXONOMY_PATH)
+    parser.add_argument('--output', default=INDEX_DIR, help='Index root directory (default: %(default)s)')
+    args = parser.parse_args()
+    directory = os.path.join(args.output, taxonomy_digest(args.taxonomy)[:16])
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    arrays, meta = compile_index(args.taxonomy)
+    save_index(arrays, meta, directory)
+    print(json.dumps({
+        'index': directory,
+        'skills': len(meta['skills']),
+        'patterns': len(meta['patterns']),
+        'states': int(arrays['delta'].shape[0]),
+        'bytes': sum(int(array.nbytes) for array in arrays.values())
+    }))
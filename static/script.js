@@ -43,6 +43,9 @@ document.addEventListener('DOMContentLoaded', function() {
     let currentCoverLetterSessionId = null;
     let currentPreviewType = null;
     
+    // Cover letter produced alongside the last ATS analysis (via /analyze-all)
+    let prefetchedCoverLetter = null;
+    
     // Handle file selection display
     resumeInput.addEventListener('change', function() {
         if (this.files && this.files.length > 0) {
@@ -165,8 +168,9 @@ document.addEventListener('DOMContentLoaded', function() {
         // Simulate progress steps for ATS analysis
         simulateAtsProgress();
         
-        // Send API request
-        fetch('/analyze-ats', {
+        // Send API request (the cover letter is generated concurrently on the server)
+        const requestKey = getRequestKey(resumeFile, jobDescription);
+        fetch('/analyze-all', {
             method: 'POST',
             body: formData
         })
@@ -181,6 +185,10 @@ document.addEventListener('DOMContentLoaded', function() {
         .then(data => {
             // Store session ID for downloads
             currentAtsSessionId = data.session_id;
+            prefetchedCoverLetter = {
+                key: requestKey,
+                data: { session_id: data.session_id, cover_letter: data.cover_letter }
+            };
             
             // Complete progress animation
             completeProgress();
@@ -204,6 +212,16 @@ document.addEventListener('DOMContentLoaded', function() {
         const resumeFile = resumeInput.files[0];
         const jobDescription = document.getElementById('job-description').value.trim();
         
+        // Reuse the cover letter generated with the ATS analysis for the same inputs
+        if (prefetchedCoverLetter && prefetchedCoverLetter.key === getRequestKey(resumeFile, jobDescription)) {
+            currentCoverLetterSessionId = prefetchedCoverLetter.data.session_id;
+            populateCoverLetterResults(prefetchedCoverLetter.data);
+            uploadSection.classList.add('hidden');
+            atsResultsSection.classList.add('hidden');
+            coverLetterResultsSection.classList.remove('hidden');
+            return;
+        }
+        
         // Show loading screen
         showLoadingScreen('Cover Letter Generation', 'Creating a personalized cover letter based on your resume and the job description...');
         
@@ -212,11 +230,13 @@ document.addEventListener('DOMContentLoaded', function() {
         formData.append('resume', resumeFile);
         formData.append('job_description', jobDescription);
         
-        // Simulate progress steps for cover letter
+        // Simulate progress steps until the first tokens arrive
         simulateCoverLetterProgress();
         
-        // Send API request
-        fetch('/generate-cover-letter', {
+        // Stream the cover letter as it is written
+        const coverLetterPreview = document.getElementById('cover-letter-preview');
+        let streamedText = '';
+        fetch('/generate-cover-letter/stream', {
             method: 'POST',
             body: formData
         })
@@ -226,21 +246,25 @@ document.addEventListener('DOMContentLoaded', function() {
                     throw new Error(err.error || `Server error: ${response.status}`);
                 });
             }
-            return response.json();
-        })
-        .then(data => {
-            // Store session ID for downloads
-            currentCoverLetterSessionId = data.session_id;
-            
-            // Complete progress animation
-            completeProgress();
-            
-            // Populate cover letter results
-            setTimeout(() => {
-                populateCoverLetterResults(data);
-                loadingSection.classList.add('hidden');
-                coverLetterResultsSection.classList.remove('hidden');
-            }, 500);
+            return readEventStream(response, (event, data) => {
+                if (event === 'delta') {
+                    // Show the letter as soon as the first tokens arrive
+                    if (!streamedText) {
+                        loadingSection.classList.add('hidden');
+                        coverLetterResultsSection.classList.remove('hidden');
+                    }
+                    streamedText += data.text;
+                    coverLetterPreview.textContent = streamedText;
+                } else if (event === 'result') {
+                    currentCoverLetterSessionId = data.session_id;
+                    completeProgress();
+                    populateCoverLetterResults(data);
+                    loadingSection.classList.add('hidden');
+                    coverLetterResultsSection.classList.remove('hidden');
+                } else if (event === 'error') {
+                    throw new Error(data.error);
+                }
+            });
         })
         .catch(error => {
             console.error('Error:', error);
@@ -249,6 +273,40 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Read a text/event-stream response, calling onEvent(event, data) for each message
+    function readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        function pump() {
+            return reader.read().then(({ done, value }) => {
+                if (done) return;
+                buffer += decoder.decode(value, { stream: true });
+                
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    const message = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    
+                    let event = 'message';
+                    let data = '';
+                    message.split('\n').forEach(line => {
+                        if (line.startsWith('event:')) {
+                            event = line.slice(6).trim();
+                        } else if (line.startsWith('data:')) {
+                            data += line.slice(5).trim();
+                        }
+                    });
+                    onEvent(event, data ? JSON.parse(data) : null);
+                }
+                return pump();
+            });
+        }
+        
+        return pump();
+    }
+    
     // Regenerate ATS analysis
     function regenerateAtsAnalysis() {
         showLoadingScreen('Regenerating ATS Analysis', 'Re-analyzing your resume with fresh insights...');
@@ -313,6 +371,11 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Identify a resume/job description pair
+    function getRequestKey(file, jobDescription) {
+        return [file.name, file.size, file.lastModified, jobDescription].join('|');
+    }
+    
     // Show loading screen
     function showLoadingScreen(title, description) {
         uploadSection.classList.add('hidden');
@@ -573,9 +636,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 if (data.score_comparison && scoreComparisonSection) {
                     scoreComparisonSection.classList.remove('hidden');
                     const originalScore = Math.round(data.score_comparison.original_score);
-                    const optimizedScore = Math.round(data.score_comparison.optimized_score);
                     originalScoreValue.textContent = originalScore;
-                    optimizedScoreValue.textContent = optimizedScore;
+                    showOptimizedScore(data.score_comparison);
                 }
             } else {
                 previewContent.innerHTML = formatCoverLetterContent(data.content);
@@ -592,6 +654,38 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // The optimized score is computed in the background; wait for it over SSE
+    let optimizedScoreSource = null;
+    function showOptimizedScore(scoreComparison) {
+        if (optimizedScoreSource) {
+            optimizedScoreSource.close();
+            optimizedScoreSource = null;
+        }
+        if (scoreComparison.optimized_score_status !== 'pending') {
+            optimizedScoreValue.textContent = scoreComparison.optimized_score === null
+                ? '–' : Math.round(scoreComparison.optimized_score);
+            return;
+        }
+        optimizedScoreValue.textContent = '…';
+        optimizedScoreSource = new EventSource(scoreComparison.score_stream_url);
+        const finish = event => {
+            const state = JSON.parse(event.data);
+            optimizedScoreValue.textContent = state.optimized_score === null
+                ? '–' : Math.round(state.optimized_score);
+            optimizedScoreSource.close();
+            optimizedScoreSource = null;
+        };
+        optimizedScoreSource.addEventListener('score', finish);
+        optimizedScoreSource.addEventListener('timeout', finish);
+        optimizedScoreSource.onerror = () => {
+            if (optimizedScoreSource) {
+                optimizedScoreSource.close();
+                optimizedScoreSource = null;
+            }
+            optimizedScoreValue.textContent = '–';
+        };
+    }
+
     // Format resume content with styling
     function formatResumeContent(content) {
         let html = '<div class="resume-preview">';
@@ -764,5 +858,6 @@ document.addEventListener('DOMContentLoaded', function() {
         // Reset session IDs
         currentAtsSessionId = null;
         currentCoverLetterSessionId = null;
+        prefetchedCoverLetter = null;
     }
 });
@@ -0,0 +1,63 @@
+import os
+import re
+import hashlib
+import threading
+
+from result_cache import MemoryCacheTier, SQLiteCacheTier, ResultCache
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def normalize_extracted_text(text):
+    # Unify line endings, drop trailing spaces and squeeze blank runs; line
+    # structure is kept because section detection depends on it
+    lines = [line.rstrip() for line in (text or '').replace('\r\n', '\n').replace('\r', '\n').split('\n')]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+# Content-addressed cache: SHA-256 of the upload bytes -> extracted text
+class ExtractedTextCache:
+    def __init__(self, cache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._parse_seconds = 0.0
+        self._parse_seconds_saved = 0.0
+
+    def get(self, digest):
+        entry = self.cache.get(digest)
+        if entry is not None:
+            with self._lock:
+                self._parse_seconds_saved += entry['parse_seconds']
+        return entry
+
+    def set(self, digest, text, parse_seconds):
+        entry = {
+            'text': text,
+            'parse_seconds': round(parse_seconds, 6)
+        }
+        self.cache.set(digest, entry)
+        with self._lock:
+            self._parse_seconds += parse_seconds
+        return entry
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self.cache.stats(),
+                'parse_seconds': round(self._parse_seconds, 4),
+                'parse_seconds_saved': round(self._parse_seconds_saved, 4)
+            }
+
+def create_text_cache(max_entries=None, ttl=None, db_path=None):
+    max_entries = max_entries or int(os.getenv("TEXT_CACHE_SIZE", "128"))
+    ttl = ttl if ttl is not None else int(os.getenv("TEXT_CACHE_TTL", "86400"))
+    db_path = db_path or os.getenv("TEXT_CACHE_DB")
+
+    tiers = [MemoryCacheTier(max_entries=max_entries, ttl=ttl)]
+    if db_path:
+        tiers.append(SQLiteCacheTier(db_path, ttl=int(os.getenv("TEXT_CACHE_DB_TTL", str(7 * 86400)))))
+    return ExtractedTextCache(ResultCache(tiers))
@@ -0,0 +1,204 @@
+import os
+import re
+import json
+import threading
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from resume_sections import parse_resume
+
+# Per-chain prompt budgets in tokens (TOKEN_BUDGET_<CHAIN_NAME> overrides)
+DEFAULT_BUDGETS = {
+    'ats_analysis': 6000,
+    'resume_optimization': 8000,
+    'cover_letter': 6000,
+    'section_rewrite': 2500,
+    'analyze_and_optimize': 9000
+}
+
+# Inputs trimmed, in order, when a prompt is still over budget after compaction
+TRIM_ORDER = ['job_description', 'resume_text']
+MIN_FIELD_TOKENS = 200
+ATS_SUGGESTIONS_LIMIT = int(os.getenv("ATS_SUGGESTIONS_LIMIT", "3"))
+
+def chain_budget(chain_name):
+    return int(os.getenv(f"TOKEN_BUDGET_{chain_name.upper()}", str(DEFAULT_BUDGETS.get(chain_name, 8000))))
+
+# Token counting: tiktoken when its encoding is available locally, otherwise an
+# estimate of roughly four characters per token
+@lru_cache(maxsize=8)
+def _encoding(model_name):
+    if tiktoken is None:
+        return None
+    try:
+        encoding_name = os.getenv("TOKEN_ENCODING")
+        if encoding_name:
+            return tiktoken.get_encoding(encoding_name)
+        try:
+            return tiktoken.encoding_for_model(model_name or '')
+        except KeyError:
+            return tiktoken.get_encoding('o200k_base')
+    except Exception:
+        # Encodings are downloaded on first use; offline hosts fall back to the estimate
+        return None
+
+def count_tokens(text, model_name=None):
+    encoding = _encoding(model_name)
+    if encoding is None:
+        return (len(text or '') + 3) // 4
+    return len(encoding.encode(text or '', disallowed_special=()))
+
+def truncate_tokens(text, max_tokens, model_name=None):
+    encoding = _encoding(model_name)
+    if encoding is None:
+        truncated = text[:max_tokens * 4]
+    else:
+        truncated = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    # Prefer cutting at a line break so the model never sees half a bullet
+    cut = truncated.rfind('\n')
+    if cut > len(truncated) // 2:
+        truncated = truncated[:cut]
+    return truncated
+
+# Resume trimming: whole low-priority sections go before any hard truncation
+RESUME_DROP_ORDER = ('other', 'projects', 'certifications')
+
+def trim_resume(text, max_tokens, model_name=None):
+    sections = list(parse_resume(text).sections)
+    for kind in RESUME_DROP_ORDER:
+        if count_tokens(text, model_name) <= max_tokens:
+            return text
+        if not any(section.kind == kind for section in sections):
+            continue
+        sections = [section for section in sections if section.kind != kind]
+        text = '\n\n'.join(section.text for section in sections)
+    if count_tokens(text, model_name) <= max_tokens:
+        return text
+    return truncate_tokens(text, max_tokens, model_name)
+
+# Job description boilerplate
+BOILERPLATE_HEADINGS = re.compile(
+    r"^\s*(?:benefits|perks|perks\s*(?:&|and)\s*benefits|what we offer|why join us|our benefits|"
+    r"compensation\s*(?:&|and)\s*benefits|equal (?:employment )?opportunity(?: employer| statement)?|"
+    r"eeo(?: statement)?|diversity(?:,? equity)?(?:,? (?:and|&) inclusion)?|about us|about the company)\s*:?\s*$",
+    re.IGNORECASE
+)
+BOILERPLATE_SENTENCE = re.compile(
+    r"equal (?:employment )?opportunity|without regard to|regardless of (?:race|age|gender)|"
+    r"race, colou?r, religion|sexual orientation|gender identity|protected veteran|"
+    r"reasonable accommodations?|e-verify|401\(?k\)?|paid time off|health, dental|dental(?:,| and) vision",
+    re.IGNORECASE
+)
+HEADING_LINE = re.compile(r"^\s*[A-Za-z][A-Za-z &,'/-]{1,60}:?\s*$")
+
+def strip_boilerplate(job_description):
+    # Drops benefits / EEO / company-blurb sections and stray EEO or benefits sentences
+    kept = []
+    skipping = False
+    for line in (job_description or '').splitlines():
+        if BOILERPLATE_HEADINGS.match(line):
+            skipping = True
+            continue
+        if skipping and HEADING_LINE.match(line) and not line.strip().startswith(('-', '*', '•')):
+            skipping = False
+        if skipping:
+            continue
+        sentences = re.split(r"(?<=[.!?])\s+", line)
+        line = ' '.join(sentence for sentence in sentences if not BOILERPLATE_SENTENCE.search(sentence))
+        if line.strip() or (kept and kept[-1].strip()):
+            kept.append(line)
+    return '\n'.join(kept).strip()
+
+# ATS analysis compaction for the optimizer prompt
+COMPACT_ATS_FIELDS = [
+    'missing_keywords', 'improvement_suggestions', 'searchability_suggestions', 'skills_suggestions',
+    'formatting_suggestions', 'section_suggestions', 'synonym_suggestions'
+]
+
+def compact_ats_analysis(ats_analysis, suggestions_limit=ATS_SUGGESTIONS_LIMIT):
+    # The optimizer only acts on the score, the missing keywords and the top
+    # suggestions; sub-scores and issue counts are dropped
+    if isinstance(ats_analysis, str):
+        try:
+            ats_analysis = json.loads(ats_analysis)
+        except ValueError:
+            return ats_analysis
+    compact = {'total_ats_score': ats_analysis.get('total_ats_score')}
+    for field in COMPACT_ATS_FIELDS:
+        values = ats_analysis.get(field) or []
+        if field != 'missing_keywords':
+            values = values[:suggestions_limit]
+        if values:
+            compact[field] = values
+    return json.dumps(compact, separators=(',', ':'))
+
+# Budget enforcement
+def _prompt_tokens(prompt, inputs, model_name):
+    return count_tokens(prompt.format(**inputs), model_name)
+
+def fit_to_budget(chain_name, prompt, inputs, model_name=None, budget=None):
+    # Returns (inputs, report); the caller's inputs are never modified
+    budget = budget or chain_budget(chain_name)
+    raw_tokens = _prompt_tokens(prompt, inputs, model_name)
+
+    fitted = dict(inputs)
+    if 'job_description' in fitted:
+        fitted['job_description'] = strip_boilerplate(fitted['job_description']) or fitted['job_description']
+    if 'ats_analysis' in fitted:
+        fitted['ats_analysis'] = compact_ats_analysis(fitted['ats_analysis'])
+    prompt_tokens = _prompt_tokens(prompt, fitted, model_name)
+
+    truncated = []
+    for field in TRIM_ORDER:
+        if prompt_tokens <= budget:
+            break
+        if field not in fitted:
+            continue
+        field_tokens = count_tokens(fitted[field], model_name)
+        keep = max(MIN_FIELD_TOKENS, field_tokens - (prompt_tokens - budget))
+        if keep >= field_tokens:
+            continue
+        trim = trim_resume if field == 'resume_text' else truncate_tokens
+        fitted[field] = trim(fitted[field], keep, model_name)
+        truncated.append(field)
+        prompt_tokens = _prompt_tokens(prompt, fitted, model_name)
+
+    return fitted, {
+        'chain': chain_name,
+        'budget': budget,
+        'raw_prompt_tokens': raw_tokens,
+        'prompt_tokens': prompt_tokens,
+        'tokens_saved': raw_tokens - prompt_tokens,
+        'truncated': truncated,
+        'over_budget': prompt_tokens > budget
+    }
+
+class TokenStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chains = {}
+
+    def record(self, report):
+        with self._lock:
+            stats = self._chains.setdefault(report['chain'], {
+                'calls': 0, 'prompt_tokens': 0, 'tokens_saved': 0, 'truncated_calls': 0, 'over_budget_calls': 0
+            })
+            stats['calls'] += 1
+            stats['prompt_tokens'] += report['prompt_tokens']
+            stats['tokens_saved'] += report['tokens_saved']
+            stats['truncated_calls'] += bool(report['truncated'])
+            stats['over_budget_calls'] += report['over_budget']
+
+    def stats(self):
+        with self._lock:
+            chains = {name: dict(stats) for name, stats in self._chains.items()}
+        return {
+            'tokenizer': 'tiktoken' if _encoding(None) is not None else 'estimate',
+            'budgets': {name: chain_budget(name) for name in DEFAULT_BUDGETS},
+            'chains': chains,
+            'tokens_saved': sum(stats['tokens_saved'] for stats in chains.values())
+        }
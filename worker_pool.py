@@ -0,0 +1,80 @@
+import os
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+class PoolBusyError(Exception):
+    pass
+
+# ProcessPoolExecutor wrapper: created lazily, bounded in how much work may wait,
+# awaitable from any event loop and with a per-call timeout
+class BoundedProcessPool:
+    def __init__(self, name, max_workers=None, max_pending=None, timeout=None, mp_context=None):
+        self.name = name
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.max_pending = max_pending or self.max_workers * 8
+        self.timeout = timeout
+        # spawn avoids forking a process that already runs the LLM event loop thread
+        self.mp_context = mp_context or os.getenv("WORKER_MP_CONTEXT", "spawn")
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'timeouts': 0, 'rejected': 0}
+        self._pending = 0
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context(self.mp_context)
+                    )
+        return self._executor
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._counters['rejected'] += 1
+                raise PoolBusyError(f"{self.name} pool has {self._pending} tasks waiting")
+            self._pending += 1
+            self._counters['submitted'] += 1
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._counters['failed'] += 1
+            else:
+                self._counters['completed'] += 1
+
+    async def run(self, fn, *args, timeout=None):
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # A task already running in a worker cannot be interrupted; it is only abandoned
+            future.cancel()
+            with self._lock:
+                self._counters['timeouts'] += 1
+            raise
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                'pending': self._pending,
+                'queued': max(0, self._pending - self.max_workers),
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending
+            }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None